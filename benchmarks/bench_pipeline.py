@@ -0,0 +1,240 @@
+"""
+Phase timings for the render pipeline on synthetic briefings at 1x, 10x
+and 100x the size of a real one.
+
+    python benchmarks/bench_pipeline.py [spec] [--scales 1 10 100] [-o results.json]
+    python benchmarks/bench_pipeline.py --compare old.json new.json
+
+A scale-k briefing repeats the spec's Part B sections and Part C rows k
+times (and each layer's bullets --layer-scale times); Part A is bounded
+by prompt.md and stays as it is. Each scale runs in a fresh process so its
+peak RSS is its own. Phases: template load and body strip (cold, as on
+the first render of a process), skeleton clone and cover (every render),
+Part A, Part B, Part C and save; --stream times the streamed writer
+instead, where each Part includes writing its XML.
+
+The body-strip check from the single-pass truncation work is included:
+strip_body on template bodies of 1k-40k blocks should scale linearly.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import populate_template as pt
+from briefing_spec import LAYERS, load_briefing
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Emu
+from docx_package import DocumentStream, save_package
+from docx_xml import para_xml, run_xml, table_xml
+
+DEFAULT_SPEC = os.path.join(pt.BASE, "briefings", "ECLC_HIB_003_20251114.json")
+STRIP_SIZES = (1000, 10000, 40000)
+
+
+# ── Synthetic briefings ──
+
+def synthesize(briefing, scale, layer_scale=1):
+    """`briefing` with its sections and Part C rows repeated `scale` times
+    and each layer's bullets `layer_scale` times."""
+    sections = []
+    for k in range(scale):
+        for sec in briefing.sections:
+            layers = {key: sec.layer(key) * layer_scale for key in LAYERS}
+            title = sec.title if k == 0 else f"{sec.title} ({k + 1})"
+            sections.append(replace(sec, title=title, **layers))
+    qons = [replace(q, number=str(i + 1))
+            for i, q in enumerate(briefing.questions_on_notice * scale)]
+    return replace(briefing, sections=sections, questions_on_notice=qons,
+                   quotes=briefing.quotes * scale, actions=briefing.actions * scale)
+
+
+def size_of(briefing):
+    return {"sections": len(briefing.sections),
+            "bullets": sum(len(s.layer(k)) for s in briefing.sections for k in LAYERS),
+            "part_c_rows": len(briefing.questions_on_notice) + len(briefing.quotes)
+            + len(briefing.actions)}
+
+
+# ── Phases ──
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def render_phases(briefing, out, stream=False):
+    """Time one render of `briefing` to `out`, phase by phase (ms)."""
+    times = dict.fromkeys(("clone", "cover", "part_a", "part_b", "part_c", "save"), 0.0)
+    clock = time.perf_counter
+
+    t = clock()
+    doc = pt.skeletons.document(pt.TEMPLATE)
+    times["clone"] = clock() - t
+    t = clock()
+    pt.fill_cover(doc, briefing.cover)
+    times["cover"] = clock() - t
+
+    if stream:
+        ctx = DocumentStream(doc, pt.skeletons.skeleton(pt.TEMPLATE), out)
+        t = clock()
+        stream_out = ctx.__enter__()
+        times["save"] += clock() - t
+    t = clock()
+    for name in pt.build_body(doc, briefing):
+        if stream:
+            stream_out.flush()
+        now = clock()
+        times[name.split(".")[0]] += now - t
+        t = now
+    t = clock()
+    if stream:
+        ctx.__exit__(None, None, None)
+    else:
+        save_package(doc, pt.skeletons.skeleton(pt.TEMPLATE), out)
+    times["save"] += clock() - t
+    return {k: v * 1000 for k, v in times.items()}
+
+
+def cold_phases():
+    """Template load and body strip as the first render of a process pays them."""
+    t = time.perf_counter()
+    doc = Document(pt.TEMPLATE)
+    load = time.perf_counter() - t
+    t = time.perf_counter()
+    pt.strip_body(doc)
+    strip = time.perf_counter() - t
+    return {"template_load": load * 1000, "body_strip": strip * 1000}
+
+
+def run_scale(spec, scale, layer_scale, repeats, stream):
+    """One scale in this process; returns its result record."""
+    briefing = synthesize(load_briefing(spec), scale, layer_scale)
+    phases = cold_phases()
+    pt.skeletons.skeleton(pt.TEMPLATE)   # warm, as in a batch
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, briefing.output_name)
+        for _ in range(repeats):
+            run = render_phases(briefing, out, stream)
+            best = run if best is None else {k: min(best[k], run[k]) for k in run}
+        output_bytes = os.path.getsize(out)
+    phases.update(best)
+    return {"scale": scale, "layer_scale": layer_scale, **size_of(briefing),
+            "phases_ms": {k: round(v, 2) for k, v in phases.items()},
+            "render_ms": round(sum(best.values()), 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "output_bytes": output_bytes}
+
+
+def strip_scaling(sizes=STRIP_SIZES):
+    """strip_body time on template bodies padded to `sizes` blocks."""
+    para = para_xml(run_xml("Synthetic body paragraph"))
+    results = []
+    for n in sizes:
+        doc = Document(pt.TEMPLATE)
+        sect = doc.element.body[-1]
+        for i in range(n):
+            # One table in ten, as in a rendered body
+            if i % 10 == 0:
+                block = table_xml([[para, para]], 2, Emu(914400))
+            else:
+                block = parse_xml(para.replace("<w:p>", f"<w:p {nsdecls('w')}>", 1))
+            sect.addprevious(block)
+        t = time.perf_counter()
+        pt.strip_body(doc)
+        ms = (time.perf_counter() - t) * 1000
+        results.append({"blocks": n, "ms": round(ms, 2), "us_per_block": round(ms * 1000 / n, 3)})
+    return results
+
+
+# ── Reporting ──
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=pt.BASE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results):
+    phases = list(results["results"][0]["phases_ms"])
+    print(f"{'scale':>6} {'sections':>8} {'bullets':>8} " + " ".join(f"{p:>13}" for p in phases)
+          + f" {'render':>9} {'RSS MB':>7} {'bytes':>11}")
+    for r in results["results"]:
+        print(f"{r['scale']:>5}x {r['sections']:>8} {r['bullets']:>8} "
+              + " ".join(f"{r['phases_ms'][p]:>13.1f}" for p in phases)
+              + f" {r['render_ms']:>9.1f} {r['peak_rss_mb']:>7.1f} {r['output_bytes']:>11,}")
+    for s in results.get("strip_scaling", []):
+        print(f"strip_body {s['blocks']:>6} blocks {s['ms']:>8.2f} ms ({s['us_per_block']} us/block)")
+
+
+def compare(old, new):
+    """Per-phase ratio new/old for scales present in both result files."""
+    before = {r["scale"]: r for r in old["results"]}
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for r in new["results"]:
+        o = before.get(r["scale"])
+        if o is None:
+            continue
+        cells = [f"{p} {r['phases_ms'][p] / o['phases_ms'][p]:.2f}x"
+                 for p in r["phases_ms"] if o["phases_ms"].get(p)]
+        cells.append(f"RSS {r['peak_rss_mb'] / o['peak_rss_mb']:.2f}x")
+        print(f"{r['scale']:>5}x  " + "  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("spec", nargs="?", default=DEFAULT_SPEC)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--layer-scale", type=int, default=1,
+                        help="also repeat each layer's bullets this many times")
+    parser.add_argument("-n", type=int, default=3, help="repetitions per scale (best of)")
+    parser.add_argument("--stream", action="store_true", help="time the streamed writer")
+    parser.add_argument("--no-strip", action="store_true", help="skip the strip_body check")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g:
+            compare(json.load(f), json.load(g))
+        return
+
+    results = {"commit": _git_commit(), "date": datetime.now().isoformat(timespec="seconds"),
+               "python": platform.python_version(), "platform": platform.platform(),
+               "spec": os.path.basename(args.spec), "repeats": args.n,
+               "mode": "stream" if args.stream else "save", "results": []}
+    # A fresh process per scale, so peak RSS is that scale's alone
+    spawn = get_context("spawn")
+    for scale in args.scales:
+        with ProcessPoolExecutor(1, mp_context=spawn) as pool:
+            results["results"].append(pool.submit(
+                run_scale, args.spec, scale, args.layer_scale, args.n, args.stream).result())
+    if not args.no_strip:
+        results["strip_scaling"] = strip_scaling()
+
+    report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
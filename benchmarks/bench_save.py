@@ -0,0 +1,66 @@
+"""
+Per-document save cost: python-docx doc.save() versus pass-through
+save_package() (raw copy of untouched parts, from the cached skeleton or
+from a skeleton file read buffered or memory-mapped) and --stream rendering.
+
+    python benchmarks/bench_save.py [spec] [-n 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import populate_template as pt
+from briefing_spec import load_briefing
+from docx_package import save_package
+
+DEFAULT_SPEC = os.path.join(pt.BASE, "briefings", "ECLC_HIB_003_20251114.json")
+
+
+def best_of(fn, n):
+    """Minimum wall time of n calls, in milliseconds."""
+    times = []
+    for _ in range(n):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("spec", nargs="?", default=DEFAULT_SPEC)
+    parser.add_argument("-n", type=int, default=20, help="repetitions (best of)")
+    args = parser.parse_args(argv)
+
+    briefing = load_briefing(args.spec)
+    skeleton = pt.skeletons.skeleton(pt.TEMPLATE)
+    doc = pt.render_document(briefing)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, briefing.output_name)
+        full = best_of(lambda: doc.save(out), args.n)
+        full_size = os.path.getsize(out)
+        raw = best_of(lambda: save_package(doc, skeleton, out), args.n)
+        raw_size = os.path.getsize(out)
+        path = os.path.join(tmp, "skeleton.docx")
+        with open(path, "wb") as f:
+            f.write(skeleton)
+        from_file = best_of(lambda: save_package(doc, path, out), args.n)
+        mapped = best_of(lambda: save_package(doc, path, out, use_mmap=True), args.n)
+        render = best_of(lambda: pt.render_document(briefing), args.n)
+        stream = best_of(lambda: pt.stream_document(briefing, out), args.n)
+
+    print(f"doc.save()            {full:8.2f} ms  ({full_size:,} bytes)")
+    print(f"save_package()        {raw:8.2f} ms  ({raw_size:,} bytes)")
+    print(f"  from file           {from_file:8.2f} ms")
+    print(f"  from file, mmap     {mapped:8.2f} ms")
+    print(f"render + save_package {render + raw:8.2f} ms")
+    print(f"render --stream       {stream:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Intermediate representation of a briefing body, and the non-DOCX sinks.
+
+The body is a sequence of logical units (each Part A subsection, the
+Part B intro, each section, each Part C table). Each unit is a short list
+of nodes – headings, paragraphs, list items, key-value and data tables,
+the grouping-note callout – built once from the spec. A sink takes the
+nodes unit by unit: populate_template.DocxSink appends them to the
+template document, HtmlSink writes a standalone HTML page and TextSink a
+plain-text digest (Part A by default). render() walks the IR once and
+feeds every sink, so extra formats cost their own output and nothing more.
+
+    sinks = [HtmlSink(), TextSink()]
+    render(briefing, sinks)
+    html, text = (s.getvalue() for s in sinks)
+"""
+import textwrap
+from collections import namedtuple
+from html import escape
+
+from briefing_spec import LAYERS
+
+TITLE = "Intelligence briefing: Senate committee hearing"
+COVER_LABELS = ("Committee", "Inquiry name", "Hearing date", "Bills/Legislation",
+                "Transcript source")
+LAYER_TITLES = {
+    "L1": "L1 \u2013 The record",
+    "L2": "L2 \u2013 Legislative and policy signal",
+    "L3": "L3 \u2013 Political intelligence",
+    "L4": "L4 \u2013 Risk and exposure",
+    "L5": "L5 \u2013 Forward look",
+}
+QON_HEADERS = ["No.", "Question or commitment", "Witness", "Senator", "Due date/status"]
+QUOTE_HEADERS = ["Speaker", "Quote (verbatim \u2013 flag if paraphrased)", "Significance", "Hansard pages"]
+ACTION_HEADERS = ["Priority", "Action item", "Suggested owner", "Timeframe"]
+FLAG_TITLES = (
+    ("Urgent action", "urgent_action"),
+    ("Significant risks or exposures", "significant_risks"),
+    ("Legislative or policy signals", "policy_signals"),
+    ("Forward preparations", "forward_preparations"),
+)
+
+# ── Nodes ──
+
+Heading = namedtuple("Heading", "level text")
+Paragraph = namedtuple("Paragraph", "text")
+# numbered items share one continuous sequence across the whole body
+# (numId=2 in the DOCX); the rest are bullets
+ListItem = namedtuple("ListItem", "text numbered")
+KeyValueTable = namedtuple("KeyValueTable", "rows")
+DataTable = namedtuple("DataTable", "headers rows")
+Callout = namedtuple("Callout", "title lines")
+
+
+# ── Units ──
+
+def _items(items, numbered=False):
+    return [ListItem(b, numbered) for b in items]
+
+def significance(items):
+    return [Heading(1, "Part A: Executive briefing"), Heading(2, "Hearing significance"),
+            *_items(items)]
+
+def priority_flags(flags):
+    nodes = [Heading(2, "Priority flags"),
+             Paragraph("The following items require SES attention, ranked by urgency.")]
+    for title, key in FLAG_TITLES:
+        nodes.append(Heading(3, title))
+        nodes += _items(getattr(flags, key) or ["Nil"])
+    return nodes
+
+def political_temperature(items):
+    return [Heading(2, "Political temperature"), *_items(items)]
+
+def forward_look(items):
+    return [Heading(2, "Forward look"), *_items(items)]
+
+def part_b_intro(grouping_note):
+    return [Heading(1, "Part B: Section briefings"), Callout("Section grouping", grouping_note)]
+
+def section(sec):
+    nodes = [Heading(2, sec.title),
+             KeyValueTable([("Hansard pages", sec.hansard), ("Witnesses", sec.witnesses)])]
+    for key in LAYERS:
+        nodes.append(Heading(3, LAYER_TITLES[key]))
+        nodes += _items(sec.layer(key), numbered=True)
+    return nodes
+
+def qon_table(items):
+    return [Heading(1, "Part C: Quick reference"),
+            Heading(3, "Table 1: Commitments and questions on notice"),
+            DataTable(QON_HEADERS, [q.cells() for q in items])]
+
+def quotes_table(items):
+    return [Heading(3, "Table 2: Key quotes"), DataTable(QUOTE_HEADERS, [q.cells() for q in items])]
+
+def actions_table(items):
+    return [Heading(3, "Table 3: Forward action items for DCCEEW"),
+            DataTable(ACTION_HEADERS, [a.cells() for a in items])]
+
+
+def body_units(briefing):
+    """The logical units of the body in document order, as
+    (name, unit, payload); unit(payload) returns the unit's nodes and
+    depends on nothing but payload."""
+    part_a = briefing.part_a
+    yield 'part_a.significance', significance, part_a.significance
+    yield 'part_a.priority_flags', priority_flags, part_a.priority_flags
+    yield 'part_a.political_temperature', political_temperature, part_a.political_temperature
+    yield 'part_a.forward_look', forward_look, part_a.forward_look
+    yield 'part_b.intro', part_b_intro, briefing.grouping_note
+    for sec in briefing.sections:
+        yield 'part_b.section', section, sec
+    yield 'part_c.qon', qon_table, briefing.questions_on_notice
+    yield 'part_c.quotes', quotes_table, briefing.quotes
+    yield 'part_c.actions', actions_table, briefing.actions
+
+
+def render(briefing, sinks):
+    """Walk the IR of `briefing` once, feeding each unit to every sink."""
+    for sink in sinks:
+        sink.begin(briefing)
+    for name, unit, payload in body_units(briefing):
+        nodes = unit(payload)
+        for sink in sinks:
+            sink.unit(name, nodes)
+    for sink in sinks:
+        sink.end()
+
+
+# ── Sinks ──
+
+class TextSink:
+    """Plain-text digest for mobile: cover line and the Parts in `parts`
+    (Part A by default), wrapped at `width`."""
+
+    suffix = ".txt"
+
+    def __init__(self, parts="A", width=72):
+        self.parts = parts
+        self.width = width
+        self.lines = []
+        self._on = False
+        self._number = 0
+
+    def _wrap(self, text, first="", rest=""):
+        self.lines += textwrap.wrap(text, self.width, initial_indent=first,
+                                    subsequent_indent=rest) or [first.rstrip()]
+
+    def begin(self, briefing):
+        cover = briefing.cover
+        self.lines += [TITLE, f"{cover.committee} \u2013 {cover.hearing_date}", cover.inquiry]
+
+    def unit(self, name, nodes):
+        for node in nodes:
+            if isinstance(node, Heading) and node.level == 1:
+                self._on = node.text[5:6] in self.parts
+            if self._on:
+                self._node(node)
+
+    def _node(self, node):
+        kind = type(node)
+        if kind is Heading:
+            text = node.text.upper() if node.level == 1 else node.text
+            underline = "=" if node.level == 1 else "-" if node.level == 2 else ""
+            self.lines += ["", text] + ([underline * len(text)] if underline else [])
+        elif kind is Paragraph:
+            self._wrap(node.text)
+        elif kind is ListItem:
+            if node.numbered:
+                self._number += 1
+                mark = f"{self._number}. "
+            else:
+                mark = "- "
+            self._wrap(node.text, mark, " " * len(mark))
+        elif kind is KeyValueTable:
+            for key, value in node.rows:
+                self._wrap(" / ".join(str(value).splitlines()), f"{key}: ", "  ")
+        elif kind is DataTable:
+            for row in node.rows:
+                # cells may be numbers (a QoN number given as an int)
+                self._wrap("; ".join(c for c in map(str, row) if c), "- ", "  ")
+        elif kind is Callout:
+            self._wrap(" ".join(node.lines), f"Note: {node.title}. ", "  ")
+
+    def end(self):
+        self.lines.append("")
+
+    def getvalue(self):
+        return "\n".join(self.lines)
+
+
+class HtmlSink:
+    """Standalone HTML page for the intranet or email."""
+
+    suffix = ".html"
+    STYLE = ("body{font-family:Aptos,Calibri,Arial,sans-serif;max-width:60em;margin:2em auto;"
+             "line-height:1.4}table{border-collapse:collapse;margin:.5em 0}"
+             "td,th{border:1px solid #999;padding:.25em .5em;vertical-align:top;text-align:left}"
+             "aside{border:1px solid #999;padding:.5em 1em;margin:1em 0}")
+
+    def __init__(self):
+        self.out = []
+        self._list = None       # 'ul' or 'ol' while a list is open
+        self._number = 0
+
+    def _close_list(self):
+        if self._list:
+            self.out.append(f"</{self._list}>")
+            self._list = None
+
+    def begin(self, briefing):
+        title = escape(briefing.output_name.rsplit(".", 1)[0])
+        self.out.append(f'<!DOCTYPE html>\n<html lang="en-AU"><head><meta charset="utf-8">'
+                        f"<title>{title}</title><style>{self.STYLE}</style></head><body>")
+        self.out.append(f"<h1>{escape(TITLE)}</h1>")
+        self._table(zip(COVER_LABELS, briefing.cover.rows()), header=None)
+
+    def _table(self, rows, header):
+        self.out.append("<table>")
+        if header:
+            self.out.append("<tr>" + "".join(f"<th>{escape(h)}</th>" for h in header) + "</tr>")
+        for row in rows:
+            row = [str(c) for c in row]     # cells may be numbers, e.g. a QoN number
+            cells = [f"<th>{escape(row[0])}</th>" if header is None else f"<td>{escape(row[0])}</td>"]
+            cells += [f"<td>{escape(c).replace(chr(10), '<br>')}</td>" for c in row[1:]]
+            self.out.append("<tr>" + "".join(cells) + "</tr>")
+        self.out.append("</table>")
+
+    def unit(self, name, nodes):
+        for node in nodes:
+            kind = type(node)
+            if kind is ListItem:
+                tag = "ol" if node.numbered else "ul"
+                if self._list != tag:
+                    self._close_list()
+                    # Numbered items continue across sections, as in the DOCX
+                    start = f' start="{self._number + 1}"' if tag == "ol" and self._number else ""
+                    self.out.append(f"<{tag}{start}>")
+                    self._list = tag
+                self._number += node.numbered
+                self.out.append(f"<li>{escape(node.text)}</li>")
+                continue
+            self._close_list()
+            if kind is Heading:
+                self.out.append(f"<h{node.level + 1}>{escape(node.text)}</h{node.level + 1}>")
+            elif kind is Paragraph:
+                self.out.append(f"<p>{escape(node.text)}</p>")
+            elif kind is KeyValueTable:
+                self._table(node.rows, header=None)
+            elif kind is DataTable:
+                self._table(node.rows, header=node.headers)
+            elif kind is Callout:
+                self.out.append(f"<aside><p><strong>Note:</strong> {escape(node.title)}</p>"
+                                + "".join(f"<p>{escape(line)}</p>" for line in node.lines)
+                                + "</aside>")
+        self._close_list()
+
+    def end(self):
+        self._close_list()
+        self.out.append("</body></html>\n")
+
+    def getvalue(self):
+        return "\n".join(self.out)
+
+
+SINKS = {"html": HtmlSink, "txt": TextSink}
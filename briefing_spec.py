@@ -0,0 +1,194 @@
+"""
+Briefing spec: the content of one hearing briefing, loaded from JSON or YAML.
+A spec holds everything populate_template.py needs to render a
+[COMMITTEE]_HIB_[NNN]_[YYYYMMDD].docx – cover metadata, Part A bullets,
+the Part B sections (L1–L5) and the three Part C tables.
+"""
+import json
+import os
+from dataclasses import MISSING, dataclass, field, fields, asdict
+from datetime import date
+
+try:
+    import yaml
+except ImportError:  # YAML specs are optional; JSON always works
+    yaml = None
+
+LAYERS = ("L1", "L2", "L3", "L4", "L5")
+SPEC_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+class SpecError(ValueError):
+    """Raised when a briefing spec is missing fields or malformed."""
+
+
+def _build(cls, data, where):
+    """Construct dataclass `cls` from dict `data`, reporting missing keys."""
+    if not isinstance(data, dict):
+        raise SpecError(f"{where}: expected a mapping, got {type(data).__name__}")
+    names = {f.name for f in fields(cls)}
+    unknown = sorted(set(data) - names)
+    if unknown:
+        raise SpecError(f"{where}: unknown field(s) {', '.join(unknown)}")
+    for f in fields(cls):
+        if f.name not in data and f.default is MISSING and f.default_factory is MISSING:
+            raise SpecError(f"{where}: missing '{f.name}'")
+    return cls(**data)
+
+
+@dataclass
+class Cover:
+    """Rows 0–4 of cover table 0."""
+    committee: str
+    inquiry: str
+    hearing_date: str
+    bills: str
+    transcript_source: str
+
+    def rows(self):
+        return [self.committee, self.inquiry, self.hearing_date,
+                self.bills, self.transcript_source]
+
+
+@dataclass
+class PriorityFlags:
+    urgent_action: list = field(default_factory=list)
+    significant_risks: list = field(default_factory=list)
+    policy_signals: list = field(default_factory=list)
+    forward_preparations: list = field(default_factory=list)
+
+
+@dataclass
+class PartA:
+    significance: list
+    priority_flags: PriorityFlags
+    political_temperature: list
+    forward_look: list
+
+
+@dataclass
+class Section:
+    """One Part B witness-bloc / bill / theme section."""
+    title: str
+    hansard: str
+    witnesses: str
+    L1: list = field(default_factory=list)
+    L2: list = field(default_factory=list)
+    L3: list = field(default_factory=list)
+    L4: list = field(default_factory=list)
+    L5: list = field(default_factory=list)
+
+    def layer(self, key):
+        return getattr(self, key)
+
+
+@dataclass
+class QonItem:
+    """Table 1 row: commitment or question on notice."""
+    number: str
+    question: str
+    witness: str
+    senator: str
+    status: str
+
+    def cells(self):
+        return [self.number, self.question, self.witness, self.senator, self.status]
+
+
+@dataclass
+class Quote:
+    """Table 2 row: key quote."""
+    speaker: str
+    quote: str
+    significance: str
+    pages: str
+
+    def cells(self):
+        return [self.speaker, self.quote, self.significance, self.pages]
+
+
+@dataclass
+class ActionItem:
+    """Table 3 row: forward action item for DCCEEW."""
+    priority: str
+    action: str
+    owner: str
+    timeframe: str
+
+    def cells(self):
+        return [self.priority, self.action, self.owner, self.timeframe]
+
+
+@dataclass
+class Briefing:
+    committee_code: str
+    number: int
+    hearing_date: date
+    cover: Cover
+    part_a: PartA
+    grouping_note: list
+    sections: list
+    questions_on_notice: list = field(default_factory=list)
+    quotes: list = field(default_factory=list)
+    actions: list = field(default_factory=list)
+
+    @property
+    def output_name(self):
+        """[COMMITTEE]_HIB_[NNN]_[YYYYMMDD].docx"""
+        return f"{self.committee_code}_HIB_{self.number:03d}_{self.hearing_date:%Y%m%d}.docx"
+
+    @classmethod
+    def from_dict(cls, data, where="spec"):
+        b = _build(cls, data, where)
+        try:
+            b.number = int(b.number)
+            if not isinstance(b.hearing_date, date):
+                b.hearing_date = date.fromisoformat(str(b.hearing_date))
+        except ValueError as e:
+            raise SpecError(f"{where}: {e}") from None
+        b.cover = _build(Cover, b.cover, f"{where}.cover")
+        b.part_a = _build(PartA, b.part_a, f"{where}.part_a")
+        b.part_a.priority_flags = _build(
+            PriorityFlags, b.part_a.priority_flags, f"{where}.part_a.priority_flags")
+        b.sections = [_build(Section, s, f"{where}.sections[{i}]")
+                      for i, s in enumerate(b.sections)]
+        b.questions_on_notice = [_build(QonItem, r, f"{where}.questions_on_notice[{i}]")
+                                 for i, r in enumerate(b.questions_on_notice)]
+        b.quotes = [_build(Quote, r, f"{where}.quotes[{i}]")
+                    for i, r in enumerate(b.quotes)]
+        b.actions = [_build(ActionItem, r, f"{where}.actions[{i}]")
+                     for i, r in enumerate(b.actions)]
+        return b
+
+    def to_dict(self):
+        d = asdict(self)
+        d["hearing_date"] = self.hearing_date.isoformat()
+        return d
+
+
+def load_briefing(path):
+    """Load a Briefing from a .json, .yaml or .yml spec file."""
+    suffix = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8") as f:
+        if suffix == ".json":
+            data = json.load(f)
+        elif suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise SpecError(f"{path}: PyYAML is required for YAML specs")
+            data = yaml.safe_load(f)
+        else:
+            raise SpecError(f"{path}: unsupported spec type '{suffix}'")
+    return Briefing.from_dict(data, where=os.path.basename(path))
+
+
+def find_specs(paths):
+    """Expand files and directories into a sorted list of spec files."""
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            for name in sorted(os.listdir(p)):
+                if name.lower().endswith(SPEC_SUFFIXES):
+                    found.append(os.path.join(p, name))
+        else:
+            found.append(p)
+    return found
@@ -0,0 +1,134 @@
+"""
+Split a transcript into per-section chunks under a token budget.
+
+    python chunker.py sources/ECLC_Hansard-20251114.pdf [--budget 12000] [--json]
+
+Chunks follow witness blocs, so each one maps to one Part B section and
+carries what that section's spec entry needs: a title, the Hansard page
+range and the witness list. A bloc over the budget is split at speaker
+turns into near-equal parts. Chunks are read from the transcript one at a
+time, so memory is bounded by the largest chunk rather than the hearing.
+
+Token counts are estimated at four UTF-8 bytes per token unless a
+`count_tokens` function for the target model is supplied.
+"""
+import argparse
+import json
+import math
+from dataclasses import asdict, dataclass
+
+from hansard import HansardIndex
+
+DEFAULT_BUDGET = 12000
+
+
+def estimate_tokens(data):
+    """Rough token count for English transcript text (bytes or str)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return (len(data) + 3) // 4
+
+
+@dataclass
+class Chunk:
+    section: int        # 1-based Part B section
+    part: int           # 1-based part within the section
+    parts: int
+    title: str
+    hansard: str        # 'pp. 12–23' for this part
+    witnesses: str      # one witness per line, as in the spec
+    offset: int         # byte range in the transcript text
+    end: int
+    tokens: int
+    text: str = ""
+
+    def section_entry(self):
+        """The fields this chunk fills in a spec 'sections' entry."""
+        return {"title": self.title, "hansard": self.hansard, "witnesses": self.witnesses}
+
+
+def _page_range(lo, hi):
+    return f"p. {lo}" if lo == hi else f"pp. {lo}–{hi}"
+
+
+def _split(cuts, start, end, n):
+    """Choose n-1 of the turn offsets in `cuts` so that [start, end) splits
+    into n parts of near-equal size."""
+    bounds, i = [start], 0
+    for k in range(1, n):
+        target = start + (end - start) * k / n
+        while i + 1 < len(cuts) and abs(cuts[i + 1] - target) <= abs(cuts[i] - target):
+            i += 1
+        if cuts and bounds[-1] < cuts[i] < end:
+            bounds.append(cuts[i])
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def plan(idx, budget=DEFAULT_BUDGET, count_tokens=None):
+    """Byte ranges for every chunk, without keeping any text: a list of
+    (bloc, [(offset, end), ...]). With `count_tokens` each candidate part
+    is read and counted exactly; otherwise sizes are estimated from bytes."""
+    with open(idx.source, "rb") as f:
+        def size(a, b):
+            if count_tokens is None:
+                return (b - a + 3) // 4
+            f.seek(a)
+            return count_tokens(f.read(b - a).decode("utf-8", "replace"))
+
+        ranges = []
+        for i, bloc in enumerate(idx.blocs):
+            start = bloc.offset
+            end = idx.blocs[i + 1].offset if i + 1 < len(idx.blocs) else idx.size
+            cuts = [idx.offset[t] for t in range(bloc.first_turn + 1, bloc.last_turn + 1)]
+            n = max(1, math.ceil(size(start, end) / budget))
+            parts = _split(cuts, start, end, n)
+            # Uneven turns can leave a part over budget; add parts until none is
+            while any(size(a, b) > budget for a, b in parts) and n <= len(cuts):
+                n += 1
+                parts = _split(cuts, start, end, n)
+            ranges.append((bloc, parts))
+        return ranges
+
+
+def chunks(idx, budget=DEFAULT_BUDGET, count_tokens=None, with_text=True):
+    """Yield Chunk objects in transcript order, reading each chunk's text
+    only when it is yielded."""
+    count = count_tokens or estimate_tokens
+    ranges = plan(idx, budget, count_tokens)
+    with open(idx.source, "rb") as f:
+        for bloc, parts in ranges:
+            witnesses = bloc.witness_lines()
+            for n, (a, b) in enumerate(parts, 1):
+                f.seek(a)
+                text = f.read(b - a).decode("utf-8", "replace")
+                # The next bloc's header may sit below a page heading; end on
+                # the page of this part's last turn
+                last = idx.turn_at(b - 1)
+                end_page = idx.page[last] if last is not None and last >= bloc.first_turn \
+                    else idx.page_at(a)
+                yield Chunk(bloc.index + 1, n, len(parts), bloc.title,
+                            _page_range(idx.page_at(a), end_page),
+                            witnesses, a, b, count(text), text if with_text else "")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split a transcript into per-section chunks.")
+    parser.add_argument("transcript", help="PDF, DOCX or text transcript")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="tokens per chunk")
+    parser.add_argument("--json", action="store_true",
+                        help="one JSON object per chunk, including its text")
+    args = parser.parse_args(argv)
+
+    idx = HansardIndex.from_file(args.transcript)
+    for c in chunks(idx, args.budget, with_text=args.json):
+        if args.json:
+            print(json.dumps(asdict(c), ensure_ascii=False))
+        else:
+            part = f" (part {c.part}/{c.parts})" if c.parts > 1 else ""
+            print(f"Section {c.section}{part}: {c.title}\n"
+                  f"    {c.hansard}, ~{c.tokens} tokens, {len(c.witnesses.splitlines())} witnesses")
+
+
+if __name__ == "__main__":
+    main()
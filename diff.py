@@ -0,0 +1,709 @@
+"""
+Structural diff between two versions of a briefing, for clearance review.
+
+    python diff.py v1/ECLC_HIB_003_20251114.docx ECLC_HIB_003_20251114.docx
+    python diff.py old.json new.json -o changes.html [--changes-only]
+    python diff.py old.docx new.docx -o redline.docx --author "EISP Branch"
+
+Either side is a spec or a rendered DOCX; both are read into the same
+outline – Part → section (Part A subsection, Part B section, Part C table)
+→ group (layer, priority flag, Hansard/witness box) → item (bullet,
+paragraph or table row) – and compared level by level. Sections pair up
+by title (unpaired ones sharing most of their items are renames); items
+pair up by a hash of their whitespace-normalised text, aligned per group
+with difflib. An item whose hash leaves one place and turns up in another
+is a move, not a delete plus an add; a deleted and an added item in the
+same place sharing most of their words is a change, shown word by word.
+Everything is dictionary lookups plus difflib over short groups, so
+thousands of bullets diff in a few tens of milliseconds.
+
+-o writes an HTML report (summary, then the new version with insertions,
+deletions, moves and changes marked) or, for .docx, a redline on the
+template whose changes are Word tracked changes (moves as moves) that
+reviewers can accept or reject. Exits 1 when the versions differ.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict, deque, namedtuple
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from html import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Emu
+
+import briefing_ir as ir
+import populate_template as pt
+from briefing_spec import load_briefing
+from docx_package import iter_body, save_package
+from docx_xml import W_SECTPR, block_width, run_xml, table_xml
+
+SIMILAR = 0.5           # word overlap above which a delete + insert is a change
+PAIR_LIMIT = 400        # larger replace blocks are paired by position only
+MOVE = "\u203a"
+
+
+# ── Outline ──
+
+Item = namedtuple("Item", "kind cells key")         # kind: bullet, numbered, para, row
+Group = namedtuple("Group", "title headers items")  # headers: None, () for key-value, or a header row
+Section = namedtuple("Section", "part title groups")
+Outline = namedtuple("Outline", "name cover sections")
+
+
+def _key(cells):
+    return "\x1f".join(" ".join(unicodedata.normalize("NFKC", c).split()) for c in cells)
+
+def _item(kind, *cells):
+    return Item(kind, cells, _key(cells))
+
+
+def outline(nodes, name="", cover=()):
+    """Fold a stream of briefing IR nodes into sections, groups and items."""
+    sections = []
+    part = sec = group = None
+    by_table = False    # Part C: each Heading 3 starts a section
+    for node in nodes:
+        kind = type(node)
+        if kind is ir.Heading:
+            if node.level == 1:
+                part = node.text.split(":")[0]
+                sec = group = None
+            elif node.level == 2 or sec is None or by_table:
+                sec, group = Section(part, node.text, []), None
+                by_table = node.level == 3
+                sections.append(sec)
+            else:
+                group = Group(node.text, None, [])
+                sec.groups.append(group)
+            continue
+        if sec is None:
+            title = node.title if kind is ir.Callout else ""
+            sec, group, by_table = Section(part, title, []), None, False
+            sections.append(sec)
+        if kind is ir.KeyValueTable or kind is ir.DataTable:
+            headers = () if kind is ir.KeyValueTable else tuple(node.headers)
+            title = ""
+            if group is not None and not group.items:
+                # A heading straight above the table titles the table
+                title = sec.groups.pop().title
+            sec.groups.append(Group(title, headers, [_item("row", *r) for r in node.rows]))
+            group = None
+            continue
+        if kind is ir.Callout:
+            sec.groups.append(Group(node.title if sec.title != node.title else "", None,
+                                    [_item("para", line) for line in node.lines]))
+            group = None
+            continue
+        if group is None:
+            group = Group("", None, [])
+            sec.groups.append(group)
+        if kind is ir.ListItem:
+            group.items.append(_item("numbered" if node.numbered else "bullet", node.text))
+        elif kind is ir.Paragraph:
+            group.items.append(_item("para", node.text))
+    return Outline(name, tuple(cover), sections)
+
+
+def docx_nodes(path):
+    """(cover rows, IR nodes) read back from a rendered briefing."""
+    cover, nodes = [], []
+    part = None
+    for block in iter_body(path):
+        if block[0] == "tbl":
+            rows = block[1]
+            if not rows:
+                continue
+            if part is None:
+                if not cover and all(len(r) == 2 for r in rows):
+                    cover = [tuple(r) for r in rows]
+            elif len(rows[0]) == 1:
+                title = rows[0][0].split(":", 1)[-1].strip()
+                nodes.append(ir.Callout(title, [line for r in rows[1:] for line in r[0].split("\n")]))
+            elif part == "B":
+                nodes.append(ir.KeyValueTable([tuple(r) for r in rows]))
+            else:
+                nodes.append(ir.DataTable(rows[0], rows[1:]))
+            continue
+        _, style, text, numbered = block
+        level = style[8:] if style.startswith("heading ") else ""
+        if level.isdigit() and text:
+            if level == "1":
+                part = text[5:6]
+            nodes.append(ir.Heading(int(level), text))
+        elif part is None or not text:
+            continue
+        elif numbered:
+            nodes.append(ir.ListItem(text, part == "B"))
+        else:
+            nodes.append(ir.Paragraph(text))
+    return cover, nodes
+
+
+def load(path):
+    """Outline of a spec file or a rendered DOCX."""
+    name = os.path.basename(path)
+    if path.lower().endswith(".docx"):
+        cover, nodes = docx_nodes(path)
+        return outline(nodes, name, cover)
+    b = load_briefing(path)
+    nodes = (n for _, unit, payload in ir.body_units(b) for n in unit(payload))
+    return outline(nodes, name, zip(ir.COVER_LABELS, b.cover.rows()))
+
+
+# ── Diff ──
+
+class Op:
+    """One item of the diff. tag is same, insert, delete, change,
+    moved_here (where = old place) or moved_away (where = new place;
+    None for a reorder within the list); a move's two ops share `pair`."""
+
+    __slots__ = ("tag", "old", "new", "where", "pair")
+
+    def __init__(self, tag, old=None, new=None):
+        self.tag = tag
+        self.old = old
+        self.new = new
+        self.where = None
+        self.pair = None
+
+    @property
+    def item(self):
+        return self.new if self.new is not None else self.old
+
+
+GroupDiff = namedtuple("GroupDiff", "title headers ops")
+SectionDiff = namedtuple("SectionDiff", "part title old_title status groups")
+Diff = namedtuple("Diff", "old new cover sections counts")
+
+
+def _pair(old, new, key):
+    """{old index: new index} for elements with equal keys, n-th with n-th."""
+    slots = defaultdict(deque)
+    for j, x in enumerate(new):
+        slots[key(x)].append(j)
+    pairs = {}
+    for i, x in enumerate(old):
+        free = slots.get(key(x))
+        if free:
+            pairs[i] = free.popleft()
+    return pairs
+
+
+def _merged(old, new, pairs):
+    """(old, new) pairs in new order; unpaired old elements follow their
+    nearest paired predecessor."""
+    after = defaultdict(list)
+    anchor = -1
+    for i, x in enumerate(old):
+        if i in pairs:
+            anchor = pairs[i]
+        else:
+            after[anchor].append(x)
+    back = {j: i for i, j in pairs.items()}
+    out = [(x, None) for x in after[-1]]
+    for j, y in enumerate(new):
+        out.append((old[back[j]] if j in back else None, y))
+        out += [(x, None) for x in after[j]]
+    return out
+
+
+def _out_of_order(pairs):
+    """Old indices of paired elements that moved: those outside a longest
+    run of pairs kept in the same relative order."""
+    order = sorted(pairs)
+    tails, tail_at, prev = [], [], {}
+    for i in order:
+        j = pairs[i]
+        k = bisect_left(tails, j)
+        prev[i] = tail_at[k - 1] if k else None
+        if k == len(tails):
+            tails.append(j)
+            tail_at.append(i)
+        else:
+            tails[k] = j
+            tail_at[k] = i
+    kept = set()
+    i = tail_at[-1] if tail_at else None
+    while i is not None:
+        kept.add(i)
+        i = prev[i]
+    return set(order) - kept
+
+
+def _numbered(old, new, key):
+    """key(x) with its occurrence count on its own side, so repeated
+    titles pair in order."""
+    keys = {}
+    for side in (old, new):
+        seen = defaultdict(int)
+        for x in side:
+            k = key(x)
+            keys[id(x)] = (k, seen[k])
+            seen[k] += 1
+    return lambda x: keys[id(x)]
+
+
+def _renames(old, new, pairs):
+    """Pair leftover sections of the same Part sharing most of their items."""
+    def keyset(sec):
+        return {it.key for g in sec.groups for it in g.items}
+    taken = set(pairs.values())
+    spare = {j: keyset(new[j]) for j in range(len(new)) if j not in taken}
+    holders = defaultdict(set)     # item key -> spare new sections holding it
+    for j, keys in spare.items():
+        for k in keys:
+            holders[k].add(j)
+    for i, sec in enumerate(old):
+        if i in pairs:
+            continue
+        keys = keyset(sec)
+        shared = defaultdict(int)
+        for k in keys:
+            for j in holders.get(k, ()):
+                shared[j] += 1
+        for j, n in sorted(shared.items(), key=lambda kv: (-kv[1], kv[0])):
+            if new[j].part == sec.part and n * 2 >= max(len(keys), len(spare[j])):
+                pairs[i] = j
+                for k in spare.pop(j):
+                    holders[k].discard(j)
+                break
+
+
+def _where(sec, group):
+    return f"{sec.title} {MOVE} {group.title}" if group.title and sec.title else sec.title or group.title
+
+
+def _similar(a, b):
+    sm = SequenceMatcher(None, a.key.split(), b.key.split(), autojunk=False)
+    return sm.quick_ratio() >= SIMILAR and sm.ratio() >= SIMILAR
+
+
+def _diff_items(old, new):
+    """Ops aligning two item lists, and the (deletes, inserts) of each
+    replaced run for change pairing."""
+    sm = SequenceMatcher(None, [i.key for i in old], [i.key for i in new], autojunk=False)
+    ops, blocks = [], []
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag == "equal":
+            ops += [Op("same", o, n) for o, n in zip(old[i1:i2], new[j1:j2])]
+            continue
+        dels = [Op("delete", o) for o in old[i1:i2]]
+        ins = [Op("insert", None, n) for n in new[j1:j2]]
+        ops += dels + ins
+        if dels and ins:
+            blocks.append((dels, ins))
+    return ops, blocks
+
+
+def diff(old, new):
+    """Diff two Outlines (see load())."""
+    skey = _numbered(old.sections, new.sections, lambda s: (s.part, s.title))
+    pairs = _pair(old.sections, new.sections, skey)
+    _renames(old.sections, new.sections, pairs)
+    reordered = {id(old.sections[i]) for i in _out_of_order(pairs)}
+
+    sections, blocks, pending = [], [], []
+    for osec, nsec in _merged(old.sections, new.sections, pairs):
+        ogroups = osec.groups if osec else []
+        ngroups = nsec.groups if nsec else []
+        gkey = _numbered(ogroups, ngroups, lambda g: g.title)
+        groups = []
+        for og, ng in _merged(ogroups, ngroups, _pair(ogroups, ngroups, gkey)):
+            ops, bl = _diff_items(og.items if og else [], ng.items if ng else [])
+            blocks += bl
+            for op in ops:
+                if op.tag == "delete":
+                    pending.append((op, _where(osec, og)))
+                elif op.tag == "insert":
+                    pending.append((op, _where(nsec, ng)))
+            g = ng or og
+            groups.append(GroupDiff(g.title, g.headers, ops))
+        sec = nsec or osec
+        status = ("added" if osec is None else "removed" if nsec is None
+                  else "moved" if id(osec) in reordered else "changed")
+        sections.append(SectionDiff(sec.part, sec.title, osec.title if osec else None,
+                                    status, groups))
+
+    # Moves: the same hash deleted in one place and inserted in another
+    gone = defaultdict(deque)
+    for op, where in pending:
+        if op.tag == "delete":
+            gone[op.old.key].append((op, where))
+    moves = 0
+    for op, where in pending:
+        if op.tag == "insert" and gone.get(op.new.key):
+            away, was = gone[op.new.key].popleft()
+            if was == where:
+                was = where = None      # reordered within its own list
+            moves += 1
+            away.tag, away.where, away.pair = "moved_away", where, moves
+            op.tag, op.where, op.pair = "moved_here", was, moves
+
+    # Changes: what is left of a replaced run, paired by word overlap
+    for dels, ins in blocks:
+        dels = [d for d in dels if d.tag == "delete"]
+        ins = [i for i in ins if i.tag == "insert"]
+        if len(dels) * len(ins) > PAIR_LIMIT:
+            candidates = [[i] for i in ins[:len(dels)]]
+        else:
+            candidates = [ins] * len(dels)
+        for d, cands in zip(dels, candidates):
+            for i in cands:
+                if i.tag == "insert" and d.old.kind == i.new.kind and _similar(d.old, i.new):
+                    i.tag, i.old = "change", d.old
+                    d.tag = None
+                    break
+
+    counts = defaultdict(int)
+    out = []
+    for sec in sections:
+        groups = [g._replace(ops=[op for op in g.ops if op.tag]) for g in sec.groups]
+        changed = any(op.tag != "same" for g in groups for op in g.ops)
+        status = sec.status
+        if status == "changed" and sec.old_title != sec.title:
+            status = "renamed"
+        elif status == "changed" and not changed:
+            status = "same"
+        counts[status] += 1
+        for g in groups:
+            for op in g.ops:
+                counts[op.tag] += 1
+        out.append(sec._replace(status=status, groups=groups))
+    counts["moved_here"] = moves
+    cover = [(label, o, n) for (label, o), (_, n) in zip(old.cover, new.cover) if o != n]
+    return Diff(old.name, new.name, cover, out, dict(counts))
+
+
+def word_diff(old, new):
+    """(tag, text) runs turning `old` into `new`; tag is same, ins or del."""
+    a = re.findall(r"\s+|[^\s]+", old)
+    b = re.findall(r"\s+|[^\s]+", new)
+    out = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            out.append(("same", "".join(a[i1:i2])))
+            continue
+        if i2 > i1:
+            out.append(("del", "".join(a[i1:i2])))
+        if j2 > j1:
+            out.append(("ins", "".join(b[j1:j2])))
+    return out
+
+
+def summary(d):
+    c = d.counts
+    parts = [f"{c.get(k, 0)} {label}" for k, label in
+             (("insert", "inserted"), ("delete", "deleted"), ("change", "changed"),
+              ("moved_here", "moved"))]
+    secs = [f"{c[k]} {k}" for k in ("added", "removed", "renamed", "moved") if c.get(k)]
+    line = ", ".join(parts) + (f"; sections {', '.join(secs)}" if secs else "")
+    if d.cover:
+        line += f"; cover {', '.join(label for label, _, _ in d.cover)}"
+    return line
+
+
+def has_changes(d):
+    return bool(d.cover) or any(s.status != "same" for s in d.sections)
+
+
+# ── HTML report ──
+
+_STYLE = ("ins{background:#d4f4d4;text-decoration:underline}"
+          "del{background:#fbd9d9;color:#8a1f1f}"
+          ".mv{background:#dbe8fb}del.mv{color:#1f3f8a}"
+          "small{color:#555;font-style:italic}"
+          "tr.insert td{background:#eefbee}tr.delete td{background:#fdeeee}"
+          ".badge{font-size:.7em;font-weight:normal;border:1px solid #999;padding:0 .3em;"
+          "margin-left:.5em}summary{cursor:pointer}")
+
+
+def _html_words(old, new):
+    return "".join(escape(t) if tag == "same" else f"<{tag}>{escape(t)}</{tag}>"
+                   for tag, t in word_diff(old, new))
+
+
+def _html_text(op, i=0):
+    it = op.item
+    text = it.cells[i] if i < len(it.cells) else ""
+    if op.tag == "same":
+        return escape(text).replace("\n", "<br>")
+    if op.tag == "insert":
+        return f"<ins>{escape(text)}</ins>"
+    if op.tag == "delete":
+        return f"<del>{escape(text)}</del>"
+    if op.tag == "change":
+        old = op.old.cells[i] if i < len(op.old.cells) else ""
+        return _html_words(old, text)
+    if op.where is None:
+        note = " <small>reordered</small>"
+    else:
+        note = f' <small>moved {"from" if op.tag == "moved_here" else "to"} {escape(op.where)}</small>'
+    tag = "span" if op.tag == "moved_here" else "del"
+    return f'<{tag} class="mv">{escape(text)}</{tag}>' + (note if i == 0 else "")
+
+
+def _html_group(g, out):
+    if g.title:
+        out.append(f"<h4>{escape(g.title)}</h4>")
+    if g.headers is not None:
+        out.append("<table>")
+        if g.headers:
+            out.append("<tr>" + "".join(f"<th>{escape(h)}</th>" for h in g.headers) + "</tr>")
+        for op in g.ops:
+            n = len(op.item.cells)
+            out.append(f'<tr class="{op.tag}">'
+                       + "".join(f"<td>{_html_text(op, i)}</td>" for i in range(n)) + "</tr>")
+        out.append("</table>")
+        return
+    items = [op for op in g.ops if op.item.kind != "para"]
+    for op in g.ops:
+        if op.item.kind == "para":
+            out.append(f"<p>{_html_text(op)}</p>")
+    if items:
+        out.append("<ul>" + "".join(f'<li class="{op.tag}">{_html_text(op)}</li>'
+                                    for op in items) + "</ul>")
+
+
+def to_html(d, changes_only=False):
+    """HTML report of `d`: summary and changed sections first-class,
+    unchanged sections folded away (or left out with changes_only)."""
+    out = [f'<!DOCTYPE html>\n<html lang="en-AU"><head><meta charset="utf-8">'
+           f"<title>{escape(d.old)} \u2192 {escape(d.new)}</title>"
+           f"<style>{ir.HtmlSink.STYLE}{_STYLE}</style></head><body>",
+           f"<h1>{escape(d.old)} \u2192 {escape(d.new)}</h1>", f"<p>{escape(summary(d))}</p>"]
+    if d.cover:
+        out.append("<table><tr><th>Cover</th><th>Was</th><th>Now</th></tr>")
+        out += [f"<tr><th>{escape(k)}</th><td><del>{escape(o)}</del></td>"
+                f"<td><ins>{escape(n)}</ins></td></tr>" for k, o, n in d.cover]
+        out.append("</table>")
+    changed = [(n, s) for n, s in enumerate(d.sections) if s.status != "same"]
+    if changed:
+        out.append("<ul>" + "".join(f'<li><a href="#s{n}">{escape(s.part or "")} {MOVE} '
+                                    f"{escape(s.title or '(untitled)')}</a> ({s.status})</li>"
+                                    for n, s in changed) + "</ul>")
+    part = None
+    for n, s in enumerate(d.sections):
+        if s.status == "same" and changes_only:
+            continue
+        if s.part != part:
+            part = s.part
+            out.append(f"<h2>{escape(part or '')}</h2>")
+        title = escape(s.title)
+        if s.status == "renamed":
+            title = _html_words(s.old_title, s.title)
+        elif s.status in ("added", "removed"):
+            tag = "ins" if s.status == "added" else "del"
+            title = f"<{tag}>{title}</{tag}>"
+        body = []
+        for g in s.groups:
+            _html_group(g, body)
+        if s.status == "same":
+            out.append(f"<details><summary>{title} <small>unchanged</small></summary>"
+                       + "".join(body) + "</details>")
+        else:
+            out.append(f'<h3 id="s{n}">{title}<span class="badge">{s.status}</span></h3>')
+            out += body
+    out.append("</body></html>\n")
+    return "\n".join(out)
+
+
+# ── Redline DOCX ──
+
+class _Cover:
+    def __init__(self, values):
+        self.values = values
+
+    def rows(self):
+        return self.values
+
+
+class Redline:
+    """Builds body XML whose differences are Word tracked changes."""
+
+    def __init__(self, doc, author, date=None):
+        self.doc = doc
+        self.author = escape(author, {'"': "&quot;"})
+        self.date = date or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.next_id = 0
+        self.blocks = []
+        self.styles = {}
+
+    def _attrs(self):
+        self.next_id += 1
+        return f'w:id="{self.next_id}" w:author="{self.author}" w:date="{self.date}"'
+
+    def _style(self, name):
+        if name not in self.styles:
+            self.styles[name] = self.doc.styles[name].style_id
+        return self.styles[name]
+
+    @staticmethod
+    def _deleted(text):
+        return re.sub(r"<(/?)w:t(?=[ >])", r"<\1w:delText", run_xml(text))
+
+    def runs(self, tag, text, old=None, pair=None):
+        """Runs for `text` marked as `tag` (same/insert/delete/change/moves)."""
+        if tag == "same":
+            return run_xml(text)
+        if tag == "insert":
+            return f"<w:ins {self._attrs()}>{run_xml(text)}</w:ins>"
+        if tag == "delete":
+            return f"<w:del {self._attrs()}>{self._deleted(text)}</w:del>"
+        if tag == "change":
+            return "".join(self.runs({"ins": "insert", "del": "delete"}.get(t, t), s)
+                           for t, s in word_diff(old, text))
+        move = "moveTo" if tag == "moved_here" else "moveFrom"
+        rid = self.next_id = self.next_id + 1
+        return (f'<w:{move}RangeStart w:id="{rid}" w:name="move{pair}" w:author="{self.author}"'
+                f' w:date="{self.date}"/><w:{move} {self._attrs()}>{run_xml(text)}</w:{move}>'
+                f'<w:{move}RangeEnd w:id="{rid}"/>')
+
+    def _mark(self, tag):
+        """Paragraph-mark revision for a wholly inserted, deleted or moved paragraph."""
+        mark = {"insert": "ins", "delete": "del", "moved_here": "moveTo",
+                "moved_away": "moveFrom"}.get(tag)
+        return f"<w:rPr><w:{mark} {self._attrs()}/></w:rPr>" if mark else ""
+
+    def para(self, style, tag, text, old=None, pair=None, num=None):
+        num_pr = (f'<w:numPr><w:ilvl w:val="0"/><w:numId w:val="{num}"/></w:numPr>'
+                  if num else "")
+        self.blocks.append(parse_xml(
+            f'<w:p {nsdecls("w")}><w:pPr><w:pStyle w:val="{self._style(style)}"/>{num_pr}'
+            f"{self._mark(tag)}</w:pPr>{self.runs(tag, text, old, pair)}</w:p>"))
+
+    def table(self, g):
+        cols = max([len(g.headers)] + [len(op.item.cells) for op in g.ops]) or 1
+        rows = []
+        if g.headers:
+            rows.append([f"<w:p><w:pPr><w:rPr><w:b/></w:rPr></w:pPr>"
+                         f"{run_xml(h, '<w:rPr><w:b/></w:rPr>')}</w:p>" for h in g.headers])
+        for op in g.ops:
+            tag = {"moved_here": "insert", "moved_away": "delete"}.get(op.tag, op.tag)
+            cells = []
+            for i in range(cols):
+                text = op.item.cells[i] if i < len(op.item.cells) else ""
+                old = op.old.cells[i] if op.old is not None and i < len(op.old.cells) else ""
+                cells.append(f"<w:p>{self.runs(tag, text, old) if text or old else ''}</w:p>")
+            rows.append(cells)
+        tbl = table_xml(rows, cols, Emu(block_width(self.doc) // cols),
+                        self._style("Table Grid"), "left")
+        # Whole rows inserted or deleted carry a row revision too
+        trs = tbl.findall(qn("w:tr"))[1 if g.headers else 0:]
+        for tr, op in zip(trs, g.ops):
+            mark = {"insert": "ins", "moved_here": "ins", "delete": "del",
+                    "moved_away": "del"}.get(op.tag)
+            if mark:
+                tr.insert(0, parse_xml(f'<w:trPr {nsdecls("w")}><w:{mark} {self._attrs()}/></w:trPr>'))
+        self.blocks.append(tbl)
+
+    def section(self, s):
+        tag = {"added": "insert", "removed": "delete", "renamed": "change"}.get(s.status, "same")
+        if s.title:
+            self.para("Heading 2", tag, s.title, s.old_title)
+        for g in s.groups:
+            if g.title and g.title != s.title:
+                self.para("Heading 3", tag if tag != "change" else "same", g.title)
+            if g.headers is not None:
+                self.table(g)
+                continue
+            for op in g.ops:
+                it = op.item
+                num = {"numbered": 2, "bullet": 1}.get(it.kind)
+                style = "List Paragraph" if num else "Normal"
+                old = op.old.cells[0] if op.old is not None else None
+                self.para(style, op.tag, it.cells[0], old, op.pair, num)
+
+    def flush(self):
+        sect = self.doc.element.body.find(W_SECTPR)
+        for el in self.blocks:
+            sect.addprevious(el)
+        self.blocks = []
+
+
+def to_docx(d, new_cover, path, template=pt.TEMPLATE, author="Briefing diff"):
+    """Write a redline of `d` on `template`: the cover filled from the new
+    version, a note summarising the changes, then the body with every
+    difference as a tracked change."""
+    doc = pt.skeletons.document(template)
+    if new_cover:
+        pt.fill_cover(doc, _Cover([v for _, v in new_cover]))
+    lines = [f"Changes from {d.old} to {d.new}: {summary(d)}."]
+    lines += [f"{label}: was \u2018{o}\u2019" for label, o, _ in d.cover]
+    pt.add_grouping_note(doc, lines, "Redline")
+    red = Redline(doc, author)
+    part = None
+    for s in d.sections:
+        if s.part != part:
+            part = s.part
+            heading = {"Part A": "Part A: Executive briefing", "Part B": "Part B: Section briefings",
+                       "Part C": "Part C: Quick reference"}.get(part, part or "")
+            red.para("Heading 1", "same", heading)
+        red.section(s)
+    red.flush()
+    save_package(doc, pt.skeletons.skeleton(template), path)
+
+
+def to_json(d):
+    def op_json(op):
+        out = {"op": op.tag, "text": list(op.item.cells)}
+        if op.tag == "change":
+            out["was"] = list(op.old.cells)
+        if op.where:
+            out["where"] = op.where
+        return out
+    return {"old": d.old, "new": d.new, "counts": d.counts,
+            "cover": [{"field": k, "was": o, "now": n} for k, o, n in d.cover],
+            "sections": [{"part": s.part, "title": s.title, "was": s.old_title,
+                          "status": s.status,
+                          "groups": [{"title": g.title,
+                                      "changes": [op_json(op) for op in g.ops if op.tag != "same"]}
+                                     for g in s.groups]}
+                         for s in d.sections if s.status != "same"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Structural diff between two briefing versions.")
+    parser.add_argument("old", help="earlier version (spec or DOCX)")
+    parser.add_argument("new", help="later version (spec or DOCX)")
+    parser.add_argument("-o", "--output", help="write an HTML report (.html) or redline (.docx)")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="leave unchanged sections out of the HTML report")
+    parser.add_argument("--author", default="Briefing diff",
+                        help="author of the redline's tracked changes")
+    parser.add_argument("-t", "--template", default=pt.TEMPLATE)
+    parser.add_argument("--json", action="store_true", help="print the changes as JSON")
+    args = parser.parse_args(argv)
+
+    old, new = load(args.old), load(args.new)
+    d = diff(old, new)
+    if args.json:
+        print(json.dumps(to_json(d), indent=2, ensure_ascii=False))
+    else:
+        print(f"{d.old} \u2192 {d.new}: {summary(d)}")
+        for s in d.sections:
+            if s.status != "same":
+                n = defaultdict(int)
+                for g in s.groups:
+                    for op in g.ops:
+                        n[op.tag] += 1
+                detail = ", ".join(f"{v} {k.replace('_', ' ')}" for k, v in n.items() if k != "same")
+                print(f"  {s.part} {MOVE} {s.title}: {s.status}" + (f" ({detail})" if detail else ""))
+    if args.output:
+        if args.output.lower().endswith(".docx"):
+            to_docx(d, new.cover, args.output, args.template, args.author)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(to_html(d, args.changes_only))
+        print(f"Saved to {args.output}", file=sys.stderr)
+    return 1 if has_changes(d) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Package-level input and output for rendered briefings.
+Rendering only ever changes word/document.xml, yet doc.save() inflates,
+re-parses and re-deflates every part. save_package() writes the changed
+parts and copies every other zip member's compressed bytes straight from
+the template skeleton. DocumentStream goes further and writes
+word/document.xml into the output zip as the body is built. iter_body()
+reads a finished briefing back without python-docx.
+"""
+import io
+import mmap
+import os
+import struct
+import zipfile
+
+from lxml import etree
+
+from docx_xml import W_P, W_SECTPR, W_TBL
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MARK = "hib-stream"
+
+# Local file header: signature, versions, flags, method, time, date, CRC,
+# sizes, name length, extra length (see zipfile.structFileHeader)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only mmap with the seekable() that zipfile expects (Python < 3.13)."""
+
+    def seekable(self):
+        return True
+
+
+class _MappedPackage(zipfile.ZipFile):
+    """ZipFile over a memory-mapped path. ZipFile.close() leaves a file
+    object it was handed open, so close() also unmaps the file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            super().__init__(self._map)
+        except BaseException:
+            self._map.close()
+            raise
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._map.close()
+
+
+def open_package(source, use_mmap=False):
+    """Open a .docx for reading raw members. `source` is bytes or a path;
+    with use_mmap=True a path is memory-mapped instead of read through
+    buffered file I/O, and unmapped when the package is closed."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return zipfile.ZipFile(io.BytesIO(source))
+    if use_mmap:
+        return _MappedPackage(source)
+    return zipfile.ZipFile(source)
+
+
+def copy_raw(zin, zout, info):
+    """Copy member `info` of `zin` into `zout` as stored compressed bytes,
+    without inflating or deflating it. Relies on ZipFile's fp/filelist/
+    NameToInfo/start_dir attributes, which zipfile itself uses for appends."""
+    fp = zin.fp
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    fp.seek(header[10] + header[11], os.SEEK_CUR)  # skip name + extra field
+    raw = fp.read(info.compress_size)
+
+    out = zipfile.ZipInfo(info.filename, info.date_time)
+    out.compress_type = info.compress_type
+    out.CRC = info.CRC
+    out.compress_size = info.compress_size
+    out.file_size = info.file_size
+    out.external_attr = info.external_attr
+    out.create_system = info.create_system
+    out.flag_bits = info.flag_bits & ~0x08  # sizes go in the header, no data descriptor
+    out.header_offset = zout.fp.tell()
+    zout.fp.write(out.FileHeader())
+    zout.fp.write(raw)
+    zout.filelist.append(out)
+    zout.NameToInfo[out.filename] = out
+    zout.start_dir = zout.fp.tell()
+
+
+def save_package(doc, source, path, dirty=(DOCUMENT_PART,), use_mmap=False):
+    """Save `doc` to `path`, serialising only the `dirty` parts and copying
+    every other member raw from `source` (the package `doc` was loaded
+    from, as bytes or a path). Falls back to doc.save() when the document
+    gained parts or relationships that `source` does not have. use_mmap
+    is passed to open_package()."""
+    package = doc.part.package
+    parts = {str(p.partname).lstrip("/"): p for p in package.iter_parts()}
+    with open_package(source, use_mmap) as zin:
+        names = set(zin.namelist())
+        rels = "word/_rels/document.xml.rels"
+        if (not names.issuperset(parts) or rels not in names
+                or len(doc.part.rels) != zin.read(rels).count(b"<Relationship ")):
+            doc.save(path)
+            return
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in dirty:
+                    zout.writestr(info.filename, parts[info.filename].blob,
+                                  zipfile.ZIP_DEFLATED)
+                else:
+                    copy_raw(zin, zout, info)
+
+
+def style_names(zin):
+    """styleId -> lower-case style name ('heading 1', 'list paragraph')."""
+    names = {}
+    with zin.open(STYLES_PART) as f:
+        for _, el in etree.iterparse(f, tag=_W + "style"):
+            name = el.find(_W + "name")
+            if name is not None:
+                names[el.get(_W + "styleId")] = name.get(_W + "val").lower()
+            el.clear()
+    return names
+
+
+def _text(el):
+    return "".join(n.text or "" if n.tag == _W + "t" else "\n"
+                   for n in el.iter(_W + "t", _W + "br")).strip()
+
+
+def iter_body(path, tables=True):
+    """Stream the body-level blocks of a .docx in document order, as
+    ('p', style name, text, numbered) for paragraphs and ('tbl', rows) for
+    tables, where rows is a list of lists of cell text (None with
+    tables=False). Each block is freed once yielded, so memory stays flat
+    on long documents."""
+    with open_package(path) as zin:
+        styles = style_names(zin)
+        body = _W + "body"
+        with zin.open(DOCUMENT_PART) as f:
+            for _, el in etree.iterparse(f, tag=(W_P, W_TBL)):
+                if el.getparent().tag != body:
+                    continue  # a table's own paragraphs; read with the table
+                if el.tag == W_P:
+                    ps = el.find(f"{_W}pPr/{_W}pStyle")
+                    style = styles.get(ps.get(_W + "val"), "") if ps is not None else ""
+                    yield "p", style, _text(el), el.find(f"{_W}pPr/{_W}numPr") is not None
+                elif not tables:
+                    yield "tbl", None
+                else:
+                    yield "tbl", [["\n".join(_text(p) for p in tc.iter(W_P))
+                                   for tc in tr.iterchildren(_W + "tc")]
+                                  for tr in el.iterchildren(_W + "tr")]
+                el.clear()
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+
+
+def serialize_blocks(blocks, nsmap):
+    """Serialise body-level elements as one UTF-8 fragment.
+    The blocks are moved under a throwaway wrapper carrying the document's
+    namespace map, so each block does not re-declare every namespace."""
+    wrapper = etree.Element("wrapper", nsmap=nsmap)
+    wrapper.extend(blocks)
+    data = etree.tostring(wrapper, encoding="UTF-8", xml_declaration=False)
+    return data[data.index(b">") + 1:data.rindex(b"</")]
+
+
+class DocumentStream:
+    """Stream the body of `doc` into a new .docx at `path`.
+
+    `source` is the skeleton package (bytes or a path) whose other parts
+    are copied across. On entry, the blocks already in the body (the cover
+    block) and the document prologue are written; each flush() writes and
+    detaches the blocks appended since, so memory holds one unit at a time.
+    Leaving the block writes the final w:sectPr and closes the package.
+    """
+
+    def __init__(self, doc, source, path):
+        self.doc = doc
+        self.source = source
+        self.path = path
+        self._zip = self._out = None
+
+    def __enter__(self):
+        root = self.doc.element
+        body = root.body
+        sectPr = body.find(W_SECTPR)
+        marker = etree.Comment(_MARK)
+        sectPr.addprevious(marker)
+        xml = etree.tostring(root, encoding="UTF-8", standalone=True)
+        body.remove(marker)
+        head, self._tail = xml.split(b"<!--%s-->" % _MARK.encode())
+        self._anchor = sectPr.getprevious()
+        if self._anchor is None:
+            raise ValueError("document body has no blocks before its sectPr")
+
+        self._zip = zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED)
+        self.copy_parts(exclude={DOCUMENT_PART})
+        self._out = self._zip.open(DOCUMENT_PART, "w")
+        self._out.write(head)
+        return self
+
+    def copy_parts(self, exclude):
+        with open_package(self.source) as zin:
+            for info in zin.infolist():
+                if info.filename not in exclude:
+                    copy_raw(zin, self._zip, info)
+
+    def flush(self):
+        """Write and detach every block appended since the last flush.
+        Returns the serialised fragment (b"" if nothing was added)."""
+        blocks = [el for el in self._anchor.itersiblings() if el.tag != W_SECTPR]
+        if not blocks:
+            return b""
+        fragment = serialize_blocks(blocks, self.doc.element.nsmap)
+        self._out.write(fragment)
+        return fragment
+
+    def write(self, fragment):
+        """Write an already-serialised body fragment (see flush())."""
+        self._out.write(fragment)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+                self._out.write(self._tail)
+            self._out.close()
+        finally:
+            self._zip.close()
+            if exc_type is not None:
+                os.remove(self.path)  # don't leave a truncated package behind
+        return False
@@ -0,0 +1,146 @@
+"""
+Low-level WordprocessingML helpers that work on lxml elements directly.
+python-docx rebuilds its proxy lists (doc.paragraphs, doc.tables) on every
+access and walks the grid on every table.cell(); these helpers walk w:body
+once and emit tables as XML in a single pass instead.
+"""
+import re
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Emu
+
+W_P = qn('w:p')
+W_TBL = qn('w:tbl')
+W_SECTPR = qn('w:sectPr')
+W_TC = qn('w:tc')
+W_R = qn('w:r')
+
+
+def truncate_blocks(body, keep):
+    """Remove, in one pass over `body`, every direct child whose tag is in
+    `keep` beyond the first keep[tag] of that tag (e.g. {W_P: 6, W_TBL: 2}).
+    Other children, including the final w:sectPr, stay. Returns the number
+    removed."""
+    seen = dict.fromkeys(keep, 0)
+    doomed = []
+    for el in body.iterchildren(*keep):
+        seen[el.tag] += 1
+        if seen[el.tag] > keep[el.tag]:
+            doomed.append(el)
+    for el in doomed:
+        body.remove(el)
+    return len(doomed)
+
+
+# ── Bulk table emitter ──
+#
+# Tables are generated as one XML string and parsed once, instead of
+# doc.add_table() + t.cell(r, c) per cell (each cell() call walks the grid).
+# Run properties are serialised once per table and reused for every cell.
+
+def rpr_xml(font=None, bold=False, size=None):
+    """Serialised w:rPr for runs: font name, bold, size (a docx Length)."""
+    parts = []
+    if font:
+        f = escape(font, _ATTR_ENTITIES)
+        parts.append(f'<w:rFonts w:ascii="{f}" w:hAnsi="{f}"/>')
+    if bold:
+        parts.append('<w:b/>')
+    if size is not None:
+        parts.append(f'<w:sz w:val="{int(size.pt * 2)}"/>')
+    return f"<w:rPr>{''.join(parts)}</w:rPr>" if parts else ''
+
+
+def rstyle_xml(style_id):
+    """Serialised w:rPr referring to the character style `style_id`."""
+    return f'<w:rPr><w:rStyle w:val="{escape(style_id, _ATTR_ENTITIES)}"/></w:rPr>'
+
+
+def char_style_xml(style_id, name, rpr):
+    """A character style (w:style) with the serialised w:rPr `rpr`,
+    parsed and ready to append to the styles part."""
+    return parse_xml(
+        f'<w:style {nsdecls("w")} w:type="character" w:customStyle="1"'
+        f' w:styleId="{escape(style_id, _ATTR_ENTITIES)}">'
+        f'<w:name w:val="{escape(name, _ATTR_ENTITIES)}"/>'
+        f'<w:basedOn w:val="DefaultParagraphFont"/><w:uiPriority w:val="99"/>{rpr}</w:style>')
+
+
+def _t_xml(text):
+    if len(text.strip()) < len(text):
+        return f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+    return f'<w:t>{escape(text)}</w:t>'
+
+
+def run_xml(text, rpr=''):
+    """A w:r holding `text`; tabs and newlines become w:tab / w:br as in
+    python-docx's run.text setter."""
+    text = str(text)
+    if '\t' not in text and '\n' not in text and '\r' not in text:
+        return f'<w:r>{rpr}{_t_xml(text) if text else ""}</w:r>'
+    parts = [f'<w:r>{rpr}']
+    for chunk in _BREAKS.split(text):
+        if chunk == '\t':
+            parts.append('<w:tab/>')
+        elif chunk in ('\n', '\r'):
+            parts.append('<w:br/>')
+        elif chunk:
+            parts.append(_t_xml(chunk))
+    parts.append('</w:r>')
+    return ''.join(parts)
+
+
+def para_xml(*runs):
+    """A w:p holding already-serialised runs."""
+    return f"<w:p>{''.join(runs)}</w:p>"
+
+
+def table_xml(rows, cols, col_width, style_id=None, jc=None):
+    """Build a w:tbl from `rows`, an iterable of rows of cell contents
+    (each cell a string of one or more serialised w:p). `col_width` is a
+    docx Length; every column gets the same width, as with doc.add_table().
+    Returns the parsed CT_Tbl element."""
+    twips = col_width.twips
+    tc_open = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{twips}"/></w:tcPr>'
+    tblpr = []
+    if style_id:
+        tblpr.append(f'<w:tblStyle w:val="{escape(style_id, _ATTR_ENTITIES)}"/>')
+    tblpr.append('<w:tblW w:type="auto" w:w="0"/>')
+    if jc:
+        tblpr.append(f'<w:jc w:val="{jc}"/>')
+    tblpr.append(_TBL_LOOK)
+    parts = [f"<w:tbl {nsdecls('w')}><w:tblPr>", *tblpr, '</w:tblPr><w:tblGrid>',
+             f'<w:gridCol w:w="{twips}"/>' * cols, '</w:tblGrid>']
+    for row in rows:
+        parts.append('<w:tr>')
+        for cell in row:
+            parts.append(tc_open)
+            parts.append(cell or '<w:p/>')
+            parts.append('</w:tc>')
+        parts.append('</w:tr>')
+    parts.append('</w:tbl>')
+    return parse_xml(''.join(parts))
+
+
+def block_width(doc):
+    """Text width of the last section – what doc.add_table() spreads columns over."""
+    sec = doc.sections[-1]
+    return Emu(sec.page_width - sec.left_margin - sec.right_margin)
+
+
+def append_block(doc, el):
+    """Append a block-level element to the body, before the final sectPr."""
+    sectPr = doc.element.body.find(W_SECTPR)
+    if sectPr is None:
+        doc.element.body.append(el)
+    else:
+        sectPr.addprevious(el)
+    return el
+
+
+_BREAKS = re.compile(r'(\t|\n|\r)')
+_ATTR_ENTITIES = {'"': '&quot;'}
+_TBL_LOOK = ('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+             'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>')
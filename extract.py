@@ -0,0 +1,233 @@
+"""
+Transcript text extraction: PDF, DOCX or text in, page-addressable text out.
+
+    python extract.py sources/ECLC_Hansard-20251114.pdf [-j 8]
+
+PDF pages are extracted in contiguous page ranges across a process pool.
+The normalised text is cached under .cache/transcripts/, keyed by the
+SHA-256 of the source file, as one UTF-8 file with a form feed between
+pages plus a sidecar of page start offsets. A re-run on an unchanged
+transcript only hashes it. Later stages either read the cached text file
+directly (hansard.HansardIndex, quote_check) or open it as a Transcript,
+which memory-maps it and hands out pages without copying.
+
+PDF support needs pypdf; DOCX and plain-text transcripts need nothing extra.
+"""
+import argparse
+import mmap
+import os
+import re
+import tempfile
+import unicodedata
+import zipfile
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+
+from template_cache import template_digest as file_digest
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF extraction is optional
+    PdfReader = None
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE, ".cache", "transcripts")
+EXTRACT_VERSION = 1     # bump when normalisation changes
+SOURCE_SUFFIXES = (".pdf", ".docx", ".txt")
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_digests = {}           # (path, mtime_ns, size) -> digest
+
+
+class ExtractError(ValueError):
+    """A transcript could not be read."""
+
+
+def normalise(text):
+    """One page of extracted text: NFKC (ligatures, non-breaking spaces),
+    no soft hyphens or form feeds, Unix newlines, no trailing blanks."""
+    text = unicodedata.normalize("NFKC", text).replace("\u00ad", "").replace("\f", "\n")
+    lines = re.split(r"\r\n?|\n", text)
+    return "\n".join(line.rstrip() for line in lines).strip("\n") + "\n"
+
+
+# ── Extractors ──
+
+READERS = 2             # PdfReaders a worker keeps between its page ranges
+_readers = OrderedDict()  # per worker: (path, mtime_ns, size) -> PdfReader, oldest first
+
+
+def _reader(path):
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    reader = _readers.pop(key, None) or PdfReader(path)
+    _readers[key] = reader
+    while len(_readers) > READERS:
+        _readers.popitem(last=False)
+    return reader
+
+
+def _pdf_pages(path, start, stop, reader=None):
+    reader = reader or _reader(path)
+    return [normalise(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def extract_pdf(path, workers=None):
+    if PdfReader is None:
+        raise ExtractError(f"{path}: pypdf is required for PDF transcripts")
+    reader = PdfReader(path)
+    n = len(reader.pages)
+    workers = min(workers or os.cpu_count() or 1, max(1, n // 8))
+    if workers <= 1:
+        # in this process the reader is used once and not cached, so a
+        # long-lived caller (the watcher) does not keep every version
+        return _pdf_pages(path, 0, n, reader)
+    # Contiguous ranges keep each worker's page tree lookups local
+    step = -(-n // (workers * 2))
+    bounds = [(a, min(a + step, n)) for a in range(0, n, step)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_pdf_pages, [path] * len(bounds), *zip(*bounds))
+        return [page for chunk in chunks for page in chunk]
+
+
+def extract_docx(path):
+    """Pages of a DOCX, split at page breaks Word recorded when the file was
+    last saved (w:lastRenderedPageBreak) and at explicit page breaks."""
+    pages, page, para = [], [], []
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        for event, el in etree.iterparse(f, events=("start", "end")):
+            tag = el.tag
+            if event == "start":
+                if tag == _W + "lastRenderedPageBreak" or (
+                        tag == _W + "br" and el.get(_W + "type") == "page"):
+                    page.append("".join(para))
+                    pages.append("\n".join(page))
+                    page, para = [], []
+                continue
+            if tag == _W + "t":
+                para.append(el.text or "")
+            elif tag == _W + "tab":
+                para.append("\t")
+            elif tag == _W + "br" and el.get(_W + "type") != "page":
+                para.append("\n")
+            elif tag == _W + "p":
+                page.append("".join(para))
+                para = []
+                el.clear()
+    pages.append("\n".join(page))
+    return [normalise(p) for p in pages]
+
+
+def extract_text(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return [normalise(p) for p in f.read().split("\f")]
+
+
+def extract_pages(path, workers=None):
+    """List of normalised page texts, in page order."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".pdf":
+        return extract_pdf(path, workers)
+    if suffix == ".docx":
+        try:
+            return extract_docx(path)
+        except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+            raise ExtractError(f"{path}: {e}") from None
+    if suffix == ".txt":
+        return extract_text(path)
+    raise ExtractError(f"{path}: unsupported transcript type (expected {', '.join(SOURCE_SUFFIXES)})")
+
+
+# ── Cache ──
+
+def _digest(path):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        digest = _digests[key] = file_digest(path)
+    return digest
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def text_path(source, workers=None, cache_dir=CACHE_DIR):
+    """Path of the cached, normalised text for `source`, extracting it
+    first if this content has not been seen before."""
+    stem = os.path.join(cache_dir, f"{_digest(source)}-v{EXTRACT_VERSION}")
+    path = stem + ".txt"
+    if os.path.exists(path) and os.path.exists(stem + ".idx"):
+        return path
+    pages = [p.encode("utf-8") for p in extract_pages(source, workers)]
+    offsets = array("Q", [0])
+    for p in pages:
+        offsets.append(offsets[-1] + len(p) + 1)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Text before index: an index on disk always has its text beside it
+    _atomic_write(path, b"\f".join(pages))
+    _atomic_write(stem + ".idx", offsets.tobytes())
+    return path
+
+
+class Transcript:
+    """Read-only, memory-mapped view of an extracted transcript.
+    Pages are 0-based physical pages; Hansard page numbers come from the
+    running headers (see hansard.HansardIndex)."""
+
+    def __init__(self, source, workers=None, cache_dir=CACHE_DIR):
+        self.source = source
+        self.path = text_path(source, workers, cache_dir)
+        self.offsets = array("Q")
+        with open(os.path.splitext(self.path)[0] + ".idx", "rb") as f:
+            self.offsets.frombytes(f.read())
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._view = memoryview(self._map)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def page(self, i):
+        """Page `i` as a memoryview over the mapped file (no copy); valid
+        until the Transcript is closed."""
+        return self._view[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def text(self, i):
+        return str(self.page(i), "utf-8")
+
+    def close(self):
+        self._view.release()
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:  # a caller still holds a page; unmapped when it is freed
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract transcript text into the page cache.")
+    parser.add_argument("sources", nargs="+", help="PDF, DOCX or text transcripts")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes for PDF pages (default: all cores)")
+    args = parser.parse_args(argv)
+    for source in args.sources:
+        with Transcript(source, args.jobs) as t:
+            print(f"{source}: {len(t)} pages -> {t.path}")
+
+
+if __name__ == "__main__":
+    main()
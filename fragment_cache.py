@@ -0,0 +1,85 @@
+"""
+Cache of rendered body fragments for incremental rebuilds.
+A briefing body is a sequence of logical units (each Part A subsection,
+the Part B intro, each section with its L1–L5 lists, each Part C table).
+Each unit's serialised w:body XML is stored under a hash of its content,
+so a re-render after a small edit only rebuilds the units that changed.
+
+Fragments hold no list numbers – numbered paragraphs only reference
+numId=2 – so Word numbers spliced fragments continuously, exactly as in
+a full render.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE, ".cache", "fragments")
+
+
+def _jsonable(obj):
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"cannot hash {type(obj).__name__}")
+
+
+def unit_key(name, payload, salt=""):
+    """Content hash of one logical unit. `salt` should capture everything
+    else the rendered XML depends on (renderer version, template digest)."""
+    blob = json.dumps([salt, name, payload], default=_jsonable,
+                      ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    """Rendered fragments by unit key: an in-memory LRU of up to `maxsize`
+    entries backed by one file per fragment under `cache_dir` (None for
+    memory only)."""
+
+    def __init__(self, maxsize=4096, cache_dir=CACHE_DIR):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".xml")
+
+    def _remember(self, key, fragment):
+        self._mem[key] = fragment
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            fragment = self._mem.get(key)
+            if fragment is None and self.cache_dir:
+                try:
+                    with open(self._path(key), "rb") as f:
+                        fragment = f.read()
+                except FileNotFoundError:
+                    pass
+            if fragment is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, fragment)
+            return fragment
+
+    def put(self, key, fragment):
+        with self._lock:
+            self._remember(key, fragment)
+            if not self.cache_dir:
+                return
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(fragment)
+            os.replace(tmp, path)
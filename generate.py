@@ -0,0 +1,480 @@
+"""
+Generation pipeline: transcript in, rendered briefing out.
+
+    python generate.py sources/ECLC_Hansard-20251114.pdf --number 3 \\
+        --endpoint https://api.example/v1/messages --model NAME
+    python generate.py sources/ECLC_Hansard-20251114.pdf --number 3 --stub
+
+Stages:
+
+  sections   one request per transcript chunk (see chunker.py), run
+             concurrently, each returning L1–L5 plus candidate questions
+             on notice, quotes and actions for its witness bloc;
+  part_a     executive summary and grouping note over all sections;
+  part_c     the three quick-reference tables from the section candidates
+             (runs alongside part_a);
+  render     the assembled spec goes straight to populate_template.
+
+Requests share a concurrency limit, are retried with exponential backoff
+and jitter on timeouts, 429/5xx and unparseable or malformed replies (a
+layer that is not a list of strings, a table row that is not an object),
+and are timed per stage. The endpoint is any object with `async complete(system, prompt)`;
+HTTPEndpoint speaks a Messages-style JSON API, and --stub starts a local
+stand-in model (StubServer) so the whole pipeline runs offline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import fields
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import populate_template as pt
+import register
+from briefing_spec import LAYERS, Briefing, PartA, PriorityFlags, SpecError
+from chunker import DEFAULT_BUDGET, chunks
+from hansard import TRANSCRIPT_NAME, HansardIndex
+
+PROMPT = os.path.join(pt.BASE, "prompt.md")
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class GenerationError(RuntimeError):
+    """A stage failed after all retries."""
+
+
+class RetryableError(Exception):
+    """Transient endpoint failure (timeout, rate limit, server error)."""
+
+
+# ── Endpoints ──
+
+class HTTPEndpoint:
+    """Messages-style JSON API: POST {model, system, messages, max_tokens},
+    reply {"content": [{"type": "text", "text": ...}]}. Blocking I/O runs
+    in a worker thread so many requests can be in flight."""
+
+    def __init__(self, url, model="", api_key=None, timeout=300, max_tokens=8192):
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+
+    async def complete(self, system, prompt):
+        return await asyncio.to_thread(self._post, system, prompt)
+
+    def _post(self, system, prompt):
+        body = json.dumps({"model": self.model, "max_tokens": self.max_tokens, "system": system,
+                           "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+        headers = {"content-type": "application/json"}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        req = urllib.request.Request(self.url, body, headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                reply = json.load(resp)
+        except urllib.error.HTTPError as e:
+            if e.code in RETRY_STATUS:
+                raise RetryableError(f"HTTP {e.code}") from None
+            raise GenerationError(f"{self.url}: HTTP {e.code} {e.read()[:200]!r}") from None
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise RetryableError(str(e)) from None
+        return "".join(b.get("text", "") for b in reply.get("content", []) if b.get("type") == "text")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        with server.lock:
+            server.requests += 1
+            fail = server.rng.random() < server.fail_rate
+        if server.delay:
+            time.sleep(server.delay)
+        if fail:
+            self.send_error(503)
+            return
+        text = json.dumps(_stub_reply(body["messages"][-1]["content"]), ensure_ascii=False)
+        out = json.dumps({"content": [{"type": "text", "text": text}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+def _sentences(text, n):
+    out = []
+    for line in text.splitlines():
+        m = re.match(r"^([A-Z][^:]{2,40}):\s+(.+)", line)
+        if m and len(m[2]) > 40:
+            out.append(f"{m[1].strip()}: {m[2].split('. ')[0].strip().rstrip('.')}")
+            if len(out) == n:
+                break
+    return out or ["Low signal in this excerpt"]
+
+
+def _stub_reply(prompt):
+    """Deterministic, well-formed content for each task, drawn from the prompt."""
+    task = prompt.split("\n", 1)[0].removeprefix("TASK: ").strip()
+    if task == "section":
+        excerpt = prompt.split("\nTranscript:\n", 1)[-1]
+        lines = _sentences(excerpt, 8)
+        quote = lines[0].split(": ", 1)
+        return {"L1": lines[:6], "L2": lines[6:8] or lines[:1], "L3": ["Low signal"],
+                "L4": lines[:1], "L5": lines[1:3] or lines[:1],
+                "questions_on_notice": [],
+                "quotes": [{"speaker": quote[0], "quote": quote[-1], "significance": "Stub",
+                            "pages": re.search(r"Hansard (p+\. [\d\u2013]+)", prompt)[1]}],
+                "actions": [{"priority": "MEDIUM", "action": f"Review {lines[0][:60]}",
+                             "owner": "Branch", "timeframe": "Before next hearing"}]}
+    if task == "part_a":
+        return {"significance": ["Stub significance"] * 5,
+                "priority_flags": {"urgent_action": [], "significant_risks": ["Stub risk"] * 2,
+                                   "policy_signals": ["Stub signal"] * 2, "forward_preparations": []},
+                "political_temperature": ["Stub temperature"] * 4,
+                "forward_look": ["Stub forward look"] * 3,
+                "grouping_note": ["Sections follow the witness blocs in order of appearance."]}
+    if task == "part_c":
+        data = json.loads(prompt.split("\nCandidates:\n", 1)[1])
+        rows = [r for sec in data for r in sec["quotes"]][:8]
+        acts = [r for sec in data for r in sec["actions"]][:8]
+        return {"questions_on_notice": [], "quotes": rows, "actions": acts}
+    return {}
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local stand-in model on 127.0.0.1 for tests and dry runs.
+    `fail_rate` answers that share of requests with 503 and `delay` adds
+    latency, to exercise retries and concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, fail_rate=0.0, delay=0.0, seed=0):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.fail_rate = fail_rate
+        self.delay = delay
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/messages"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+# ── Prompts ──
+
+def system_prompt(auto_transcript=False, path=PROMPT):
+    """The standing instructions from prompt.md: role, output structure and
+    tone; the transcript quality flag only for auto-generated transcripts."""
+    with open(path, encoding="utf-8") as f:
+        parts = re.split(r"\n(?=## )", f.read())
+    keep = ["## Role and context", "## Output structure", "## Tone and quality standards"]
+    if auto_transcript:
+        keep.append("## Transcript quality flag")
+    return "\n".join(p.strip().rstrip("-").strip() for p in parts if p.startswith(tuple(keep)))
+
+
+SECTION_TASK = """TASK: section
+Write Part B section {section}{part} \u2013 {title} (Hansard {hansard}) from the transcript excerpt below.
+Reply with one JSON object and nothing else, with keys:
+  "L1", "L2", "L3", "L4", "L5": lists of strings, one per dot point
+  "questions_on_notice": [{{"question", "witness", "senator", "status"}}]
+  "quotes": [{{"speaker", "quote", "significance", "pages"}}] \u2013 verbatim, exact Hansard page
+  "actions": [{{"priority", "action", "owner", "timeframe"}}]
+Witnesses:
+{witnesses}
+Transcript:
+{text}"""
+
+PART_A_TASK = """TASK: part_a
+Write Part A (executive briefing, at most 800 words) and the Part B section grouping note from the section briefings below.
+Reply with one JSON object and nothing else, with keys "significance", "political_temperature", "forward_look", "grouping_note" (lists of strings) and "priority_flags" (an object with lists "urgent_action", "significant_risks", "policy_signals", "forward_preparations").
+Sections:
+{sections}"""
+
+PART_C_TASK = """TASK: part_c
+Write the three Part C tables from the candidate rows each section produced: merge duplicates, keep the strongest quotes, and order actions by priority.
+Reply with one JSON object and nothing else, with keys "questions_on_notice" ([{{"question", "witness", "senator", "status"}}]), "quotes" ([{{"speaker", "quote", "significance", "pages"}}]) and "actions" ([{{"priority", "action", "owner", "timeframe"}}]).
+Candidates:
+{candidates}"""
+
+
+# Reply shapes: key -> what its value must be
+TEXT, ROWS, FLAGS = "list of strings", "list of objects", "object of string lists"
+TABLES = {"questions_on_notice": ROWS, "quotes": ROWS, "actions": ROWS}
+SECTION_SHAPE = {**dict.fromkeys(LAYERS, TEXT), **TABLES}
+PART_A_SHAPE = {"significance": TEXT, "priority_flags": FLAGS, "political_temperature": TEXT,
+                "forward_look": TEXT, "grouping_note": TEXT}
+PART_C_SHAPE = TABLES
+
+
+def _is_text(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _has_shape(value, kind):
+    if kind == FLAGS:
+        return isinstance(value, dict) and all(_is_text(v) for v in value.values())
+    if kind == ROWS:
+        return isinstance(value, list) and all(isinstance(r, dict) for r in value)
+    return _is_text(value)
+
+
+def parse_json(text, keys, shape=None):
+    """The JSON object in a model reply (fences and preamble tolerated);
+    ValueError if it is missing, lacks any of `keys` or has a value that
+    does not match `shape` (key -> TEXT, ROWS or FLAGS)."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in reply")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("reply is not a JSON object")
+    missing = [k for k in keys if k not in data]
+    if missing:
+        raise ValueError(f"reply missing {', '.join(missing)}")
+    for key, kind in (shape or {}).items():
+        if key in data and not _has_shape(data[key], kind):
+            raise ValueError(f"reply {key!r} is not a {kind}")
+    return data
+
+
+def known_fields(cls, data):
+    """`data` restricted to the fields of dataclass `cls`, so extra keys in a
+    model reply do not fail spec validation; non-mappings pass through for
+    Briefing.from_dict to report."""
+    if not isinstance(data, dict):
+        return data
+    names = {f.name for f in fields(cls)}
+    return {k: v for k, v in data.items() if k in names}
+
+
+# ── Pipeline ──
+
+class StageMetrics:
+    def __init__(self):
+        self.latencies = []     # seconds per successful request
+        self.retries = 0
+        self.failures = 0
+        self.started = self.finished = None
+
+    def summary(self):
+        lat = sorted(self.latencies)
+        ms = lambda s: round(s * 1000, 1)
+        return {"requests": len(lat), "retries": self.retries, "failures": self.failures,
+                "wall_ms": ms((self.finished or 0) - (self.started or 0)),
+                "mean_ms": ms(statistics.fmean(lat)) if lat else 0,
+                "p50_ms": ms(lat[len(lat) // 2]) if lat else 0,
+                "max_ms": ms(lat[-1]) if lat else 0}
+
+
+class Pipeline:
+    def __init__(self, endpoint, concurrency=4, retries=4, backoff=1.0,
+                 budget=DEFAULT_BUDGET, auto_transcript=False):
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.budget = budget
+        self.system = system_prompt(auto_transcript)
+        self.metrics = {}
+
+    def _stage(self, name):
+        m = self.metrics.setdefault(name, StageMetrics())
+        if m.started is None:
+            m.started = time.perf_counter()
+        return m
+
+    async def request(self, stage, prompt, keys, shape=None):
+        """One model call with bounded concurrency and retry/backoff; a reply
+        without `keys` or not matching `shape` is retried like a timeout."""
+        m = self._stage(stage)
+        for attempt in range(self.retries + 1):
+            async with self._slots:
+                t = time.perf_counter()
+                try:
+                    data = parse_json(await self.endpoint.complete(self.system, prompt), keys, shape)
+                except (RetryableError, ValueError) as e:
+                    error = e
+                else:
+                    m.latencies.append(time.perf_counter() - t)
+                    m.finished = time.perf_counter()
+                    return data
+            if attempt == self.retries:
+                m.failures += 1
+                raise GenerationError(f"{stage}: giving up after {attempt + 1} attempts: {error}")
+            m.retries += 1
+            # Back off outside the semaphore so waiting does not hold a slot
+            await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.0))
+
+    async def section(self, c):
+        part = f" (part {c.part} of {c.parts})" if c.parts > 1 else ""
+        prompt = SECTION_TASK.format(section=c.section, part=part, title=c.title,
+                                     hansard=c.hansard, witnesses=c.witnesses, text=c.text)
+        return c, await self.request("sections", prompt, LAYERS, SECTION_SHAPE)
+
+    async def generate(self, idx, meta):
+        """Spec dict for the transcript indexed by `idx`."""
+        self._slots = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self.section(c) for c in chunks(idx, self.budget)))
+
+        sections, candidates = {}, []
+        for c, data in results:
+            sec = sections.setdefault(c.section, {
+                "title": f"Section {c.section}: {c.title}", "hansard": "", "witnesses": c.witnesses,
+                **{k: [] for k in LAYERS}})
+            for k in LAYERS:
+                sec[k].extend(data.get(k, []))
+            candidates.append({k: data.get(k, []) for k in ("questions_on_notice", "quotes", "actions")})
+        for n, bloc in enumerate(idx.blocs, 1):
+            if n in sections:
+                sections[n]["hansard"] = bloc.hansard_range
+        sections = [sections[k] for k in sorted(sections)]
+
+        digest = json.dumps([{k: s[k] for k in ("title", *LAYERS)} for s in sections], ensure_ascii=False)
+        part_a, part_c = await asyncio.gather(
+            self.request("part_a", PART_A_TASK.format(sections=digest),
+                         ("significance", "priority_flags", "political_temperature", "forward_look"),
+                         PART_A_SHAPE),
+            self.request("part_c", PART_C_TASK.format(candidates=json.dumps(candidates, ensure_ascii=False)),
+                         ("questions_on_notice", "quotes", "actions"), PART_C_SHAPE))
+        qon = [{"number": str(i), **{k: str(r.get(k, "")) for k in ("question", "witness", "senator", "status")}}
+               for i, r in enumerate(part_c["questions_on_notice"], 1)]
+        quotes = [{k: str(r.get(k, "")) for k in ("speaker", "quote", "significance", "pages")}
+                  for r in part_c["quotes"]]
+        actions = [{k: str(r.get(k, "")) for k in ("priority", "action", "owner", "timeframe")}
+                   for r in part_c["actions"]]
+        grouping_note = part_a.pop("grouping_note", [])
+        part_a = known_fields(PartA, part_a)
+        part_a["priority_flags"] = known_fields(PriorityFlags, part_a["priority_flags"])
+        return {**meta, "part_a": part_a, "grouping_note": grouping_note, "sections": sections,
+                "questions_on_notice": qon, "quotes": quotes, "actions": actions}
+
+    async def run(self, transcript, meta, output_dir=pt.BASE, template=pt.TEMPLATE,
+                  register_db=None):
+        """Transcript to DOCX, recorded in the register at `register_db` if
+        given; returns (spec path, docx path)."""
+        t = time.perf_counter()
+        idx = await asyncio.to_thread(HansardIndex.from_file, transcript)
+        self.metrics["index"] = m = StageMetrics()
+        m.started, m.finished = t, time.perf_counter()
+
+        data = await self.generate(idx, meta)
+        try:
+            briefing = Briefing.from_dict(data, "generated")
+        except SpecError as e:
+            raise GenerationError(str(e)) from None
+
+        m = self._stage("render")
+        os.makedirs(output_dir, exist_ok=True)
+        spec_path = os.path.join(output_dir, os.path.splitext(briefing.output_name)[0] + ".json")
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump(briefing.to_dict(), f, ensure_ascii=False, indent=2)
+        output = await asyncio.to_thread(pt.render_briefing, briefing, output_dir, template,
+                                         register_db=register_db)
+        m.finished = time.perf_counter()
+        m.latencies.append(m.finished - m.started)
+        self.metrics["total"] = total = StageMetrics()
+        total.started, total.finished = t, time.perf_counter()
+        return spec_path, output
+
+
+def hearing_meta(transcript, number, meta_path=None, auto_transcript=False):
+    """Spec header fields: from --meta JSON where given, else from the
+    transcript's [COMMITTEE]_..._[YYYYMMDD] file name."""
+    meta = {}
+    if meta_path:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    m = TRANSCRIPT_NAME.match(os.path.basename(transcript))
+    code = meta.get("committee_code") or (m["committee"].upper() if m else "")
+    day = meta.get("hearing_date") or (f"{m['date'][:4]}-{m['date'][4:6]}-{m['date'][6:]}" if m else "")
+    if not code or not day:
+        raise GenerationError(f"{transcript}: name it [COMMITTEE]_..._[YYYYMMDD] or pass --meta")
+    d = date.fromisoformat(day)
+    cover = {"committee": code, "inquiry": "", "bills": "",
+             "hearing_date": f"{d:%A}, {d.day} {d:%B %Y}",
+             "transcript_source": "Auto-generated" if auto_transcript else "Hansard",
+             **meta.get("cover", {})}
+    return {"committee_code": code, "number": meta.get("number", number),
+            "hearing_date": day, "cover": cover}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and render a briefing from a transcript.")
+    parser.add_argument("transcript", help="PDF, DOCX or text transcript")
+    parser.add_argument("-n", "--number", type=int, default=1, help="briefing number (NNN)")
+    parser.add_argument("--meta", help="JSON with committee_code, number, hearing_date, cover")
+    parser.add_argument("-o", "--output-dir", default=pt.BASE)
+    parser.add_argument("-t", "--template", default=pt.TEMPLATE)
+    parser.add_argument("--register", default=register.DEFAULT_DB,
+                        help="QoN and action register to update (default: %(default)s)")
+    parser.add_argument("--no-register", dest="register", action="store_const", const=None,
+                        help="do not record QoNs and action items")
+    parser.add_argument("--endpoint", help="Messages-style API URL")
+    parser.add_argument("--model", default="")
+    parser.add_argument("--stub", action="store_true", help="use a local stand-in model")
+    parser.add_argument("--auto-transcript", action="store_true",
+                        help="transcript is auto-generated (adds the quality flag instructions)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="tokens per chunk")
+    parser.add_argument("--metrics", help="write per-stage metrics JSON here")
+    args = parser.parse_args(argv)
+    if not args.stub and not args.endpoint:
+        parser.error("pass --endpoint URL or --stub")
+
+    meta = hearing_meta(args.transcript, args.number, args.meta, args.auto_transcript)
+
+    async def run(endpoint):
+        pipeline = Pipeline(endpoint, args.concurrency, args.retries, budget=args.budget,
+                            auto_transcript=args.auto_transcript)
+        try:
+            spec, output = await pipeline.run(args.transcript, meta, args.output_dir, args.template,
+                                              args.register)
+        finally:
+            metrics = {k: m.summary() for k, m in pipeline.metrics.items()}
+            if args.metrics:
+                with open(args.metrics, "w", encoding="utf-8") as f:
+                    json.dump(metrics, f, indent=2)
+        for stage, s in metrics.items():
+            print(f"{stage:<9} {s['wall_ms']:>9.0f} ms  {s['requests']:>3} req  "
+                  f"{s['retries']} retries  p50 {s['p50_ms']:.0f} ms  max {s['max_ms']:.0f} ms")
+        print(f"Spec:     {spec}\nBriefing: {output}")
+
+    try:
+        if args.stub:
+            with StubServer() as stub:
+                asyncio.run(run(HTTPEndpoint(stub.url)))
+        else:
+            asyncio.run(run(HTTPEndpoint(args.endpoint, args.model,
+                                         os.environ.get("BRIEFING_API_KEY"))))
+    except GenerationError as e:
+        sys.exit(f"Generation failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
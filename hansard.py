@@ -0,0 +1,432 @@
+"""
+Hansard transcript ingestion: a compact, columnar index of speaker turns.
+
+    python hansard.py transcript.txt --blocs
+    python hansard.py transcript.txt --speaker "Senator Pocock" --pages 68-85
+
+The transcript is read line by line from a plain-text file (pages separated
+by form feeds, as extract.py produces from a Hansard PDF or DOCX) and never
+held in memory. Each speaker turn becomes one row across parallel arrays – speaker,
+role, party, Hansard page, time and byte offset – with names and roles
+interned. Per-speaker turn lists let "all turns by X on pp. a–b" run in
+O(log n). Witness-bloc headers ("SURNAME, Mr Given, Role, Organisation")
+are parsed as they appear, so each bloc's Hansard page range and witness
+list can be derived instead of typed into the briefing spec.
+"""
+import argparse
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from extract import text_path
+
+TRANSCRIPT_SUFFIXES = (".txt", ".pdf", ".docx")   # in order of preference
+# sources/ files are named [COMMITTEE]_..._[YYYYMMDD], e.g. ECLC_Hansard-20251114.pdf
+TRANSCRIPT_NAME = re.compile(r"^(?P<committee>[A-Za-z]+)_.*?(?P<date>\d{8})")
+
+Turn = namedtuple("Turn", "index speaker role party page minute offset end bloc")
+
+# "Friday, 14 November 2025 Senate Page 12" – may be glued to the end of a line
+_PAGE_HEADER = re.compile(r"\b\w+day, \d{1,2} \w+ \d{4}\s+Senate\s+Page\s+(\d+)")
+_TIMESTAMP = re.compile(r"^(?:\[|Committee met at )(\d{1,2}):(\d{2})\]?\s*$")
+_TITLES = r"(?:Mr|Ms|Mrs|Miss|Mx|Dr|Prof\.?|Professor|Hon\.?)"
+_HONOURS = {"AC", "AO", "AM", "OAM", "PSM", "APM", "QC", "SC", "KC", "FAA", "FTSE"}
+_TURN = re.compile(
+    r"^(?P<who>"
+    r"(?:ACTING |DEPUTY )?CHAIR(?: \((?P<chair>[^)]+)\))?"
+    r"|Senator (?:[A-Z][A-Za-z'\-]*(?: ?-[A-Za-z]+)*)(?: [A-Z][A-Za-z'\-]+)*"
+    rf"|{_TITLES} [A-Z][A-Za-z'\-]+(?: ?-[A-Za-z]+)*(?: [A-Z][A-Za-z'\-]+)?"
+    r")\s*:\s+")
+_WITNESS = re.compile(rf"^(?P<surname>(?:Mc|Mac)?[A-Z][A-Z'\- ]*[A-Z]), (?P<rest>{_TITLES}\b.*)$")
+_DOT_LEADER = re.compile(r"\.{5,}")
+_NO_BLOC = 0xFFFF
+
+
+def _name_case(name):
+    """'HANSON -YOUNG' -> 'Hanson-Young', "O'SHANASSY" -> "O'Shanassy",
+    'McDONALD' -> 'McDonald'; mixed-case words are left alone."""
+    name = re.sub(r"\s*-\s*", "-", name.strip())
+
+    def word(w):
+        if w.startswith("Mc") and w[2:].isupper():
+            return "Mc" + w[2:].capitalize()
+        return w.capitalize() if w.isupper() else w
+
+    return re.sub(r"[^\s\-']+", lambda m: word(m.group()), name)
+
+
+def _surname_key(name):
+    return _name_case(name).split()[-1].lower() if name.strip() else ""
+
+
+class Witness(namedtuple("Witness", "title given surname description")):
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return f"{self.given} {self.surname}".strip()
+
+    @property
+    def line(self):
+        """'Given Surname, Role, Organisation' – one line of a Witnesses cell."""
+        return f"{self.name}, {self.description}" if self.description else self.name
+
+
+def organisation(description):
+    """Organisation at the end of 'Role, ..., Organisation [by video link]',
+    keeping commas inside names such as 'Department of Climate Change,
+    Energy, the Environment and Water'."""
+    parts = [p.strip() for p in re.sub(r"\s*\[[^\]]*\]", "", description).split(",")]
+    org = [parts.pop()]
+    if org[0][:1].islower():
+        # '..., Energy, the Environment and Water': back to the part with a space
+        while parts:
+            org.insert(0, parts.pop())
+            if " " in org[0]:
+                break
+    return ", ".join(org)
+
+
+def parse_witness(line):
+    """Parse 'GADDES, Mr Shane, Head of Division, ..., Department of ...'."""
+    m = _WITNESS.match(line.strip())
+    if not m:
+        return None
+    parts = [p.strip() for p in m["rest"].split(",")]
+    title_given = parts.pop(0)
+    if re.fullmatch(_TITLES, title_given) and parts:
+        title_given += " " + parts.pop(0)   # 'GORDON, Professor, Iain, ...'
+    title, _, given = title_given.partition(" ")
+    while parts and parts[0] in _HONOURS:
+        parts.pop(0)
+    description = " ".join(", ".join(parts).split())
+    return Witness(title, _name_case(given), _name_case(m["surname"]), description)
+
+
+def find_transcripts(sources, committee, date):
+    """Transcripts in `sources` for one hearing (`date` as YYYYMMDD). Where
+    the same transcript is there in several formats, text is preferred."""
+    found = {}
+    for name in sorted(os.listdir(sources)):
+        m = TRANSCRIPT_NAME.match(name)
+        stem, suffix = os.path.splitext(name)
+        if (m and m["committee"].upper() == committee.upper() and m["date"] == date
+                and suffix.lower() in TRANSCRIPT_SUFFIXES and not name.startswith("~$")):
+            rank = TRANSCRIPT_SUFFIXES.index(suffix.lower())
+            if stem not in found or rank < found[stem][0]:
+                found[stem] = (rank, os.path.join(sources, name))
+    return [path for _, path in found.values()]
+
+
+def format_minute(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}" if minute >= 0 else ""
+
+
+class Bloc:
+    """One witness session: the witnesses listed in its header and the
+    range of turns until the next header."""
+
+    def __init__(self, index, witnesses, first_turn, offset=0):
+        self.index = index
+        self.witnesses = witnesses
+        self.first_turn = first_turn
+        self.offset = offset            # byte offset of the header in source
+        self.last_turn = first_turn - 1
+        self.start_page = self.end_page = 0
+
+    @property
+    def hansard_range(self):
+        """'pp. 12–23' (or 'p. 12') for the spec's Hansard pages cell."""
+        if self.start_page == self.end_page:
+            return f"p. {self.start_page}"
+        return f"pp. {self.start_page}–{self.end_page}"
+
+    @property
+    def title(self):
+        """Organisations represented, in order: a default section title."""
+        orgs = []
+        for w in self.witnesses:
+            org = organisation(w.description)
+            if org and org not in orgs:
+                orgs.append(org)
+        if len(self.witnesses) == 1:
+            return f"{self.witnesses[0].name} \u2013 {orgs[0]}" if orgs else self.witnesses[0].name
+        return ", ".join(orgs)
+
+    def witness_lines(self):
+        return "\n".join(w.line for w in self.witnesses)
+
+    def __repr__(self):
+        return f"<Bloc {self.index} {self.hansard_range} {len(self.witnesses)} witnesses>"
+
+
+class HansardIndex:
+    """Columnar speaker-turn index over one transcript."""
+
+    def __init__(self, source=None, parties=None):
+        self.source = source
+        self.parties = {k.lower(): v for k, v in (parties or {}).items()}
+        self.strings = [""]             # interned names, roles, parties
+        self._string_ids = {"": 0}
+        self.speaker = array("I")
+        self.role = array("I")
+        self.party = array("I")
+        self.page = array("I")
+        self.minute = array("h")        # minutes since midnight, -1 unknown
+        self.offset = array("Q")        # byte offset of the turn in source
+        self.bloc = array("H")
+        self.page_offset = array("Q", [0])  # byte offset where each page starts
+        self.page_number = array("I", [0])
+        self.time_offset = array("Q")       # byte offset of each [hh:mm] stamp
+        self.time_minute = array("h")
+        self.size = 0                   # bytes in source
+        self.blocs = []
+        self._by_speaker = {}           # speaker id -> array of turn indices
+        self._by_surname = {}           # lower-case surname -> [speaker id]
+
+    def __len__(self):
+        return len(self.speaker)
+
+    def _intern(self, s):
+        i = self._string_ids.get(s)
+        if i is None:
+            i = self._string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    # ── Building ──
+
+    @classmethod
+    def from_file(cls, path, parties=None):
+        """Index a transcript; PDF and DOCX files are read through the
+        extraction cache (see extract.py)."""
+        if not path.lower().endswith(".txt"):
+            path = text_path(path)
+        with open(path, "rb") as f:
+            return cls.from_lines(f, source=path, parties=parties)
+
+    @classmethod
+    def from_lines(cls, lines, source=None, parties=None):
+        """Index an iterable of byte lines (an open binary file)."""
+        idx = cls(source, parties)
+        _Builder(idx).feed(lines)
+        return idx
+
+    def _add_turn(self, name, role, page, minute, offset):
+        sid = self._intern(name)
+        party = self.parties.get(name.lower()) or self.parties.get(_surname_key(name), "")
+        self.speaker.append(sid)
+        self.role.append(self._intern(role))
+        self.party.append(self._intern(party))
+        self.page.append(page)
+        self.minute.append(minute)
+        self.offset.append(offset)
+        self.bloc.append(len(self.blocs) - 1 if self.blocs else _NO_BLOC)
+        rows = self._by_speaker.get(sid)
+        if rows is None:
+            rows = self._by_speaker[sid] = array("I")
+            self._by_surname.setdefault(_surname_key(name), []).append(sid)
+        rows.append(len(self.speaker) - 1)
+
+    # ── Queries ──
+
+    def turn(self, i):
+        s = self.strings
+        end = self.offset[i + 1] if i + 1 < len(self) else self.size
+        bloc = self.bloc[i]
+        return Turn(i, s[self.speaker[i]], s[self.role[i]], s[self.party[i]],
+                    self.page[i], self.minute[i], self.offset[i], end,
+                    None if bloc == _NO_BLOC else bloc)
+
+    def turn_at(self, offset):
+        """Index of the turn containing byte `offset` (None before the first)."""
+        i = bisect_right(self.offset, offset) - 1
+        return i if i >= 0 else None
+
+    def page_at(self, offset):
+        return self.page_number[bisect_right(self.page_offset, offset) - 1]
+
+    def minute_at(self, offset):
+        i = bisect_right(self.time_offset, offset) - 1
+        return self.time_minute[i] if i >= 0 else -1
+
+    def speakers(self):
+        return sorted(self.strings[i] for i in self._by_speaker)
+
+    def find_speakers(self, query):
+        """Speaker ids matching `query` by surname, e.g. 'Senator Pocock',
+        'Pocock' or 'Ms Parry'. A leading 'Senator' only matches senators."""
+        query = _name_case(query)
+        ids = self._by_surname.get(_surname_key(query), [])
+        if query.startswith("Senator "):
+            ids = [i for i in ids if self.strings[i].startswith("Senator ")]
+        return ids
+
+    def page_span(self, lo, hi):
+        """range of turn indices on Hansard pages lo..hi inclusive."""
+        return range(bisect_left(self.page, lo), bisect_right(self.page, hi))
+
+    def turns(self, speaker=None, pages=None):
+        """Turns by `speaker` (see find_speakers) and/or on `pages`
+        (a (lo, hi) tuple), in transcript order."""
+        lo, hi = pages or (0, 2 ** 32 - 1)
+        if speaker is None:
+            return [self.turn(i) for i in self.page_span(lo, hi)]
+        found = []
+        key = self.page.__getitem__
+        for sid in self.find_speakers(speaker):
+            rows = self._by_speaker[sid]
+            a = bisect_left(rows, lo, key=key)
+            b = bisect_right(rows, hi, key=key)
+            found.extend(rows[a:b])
+        return [self.turn(i) for i in sorted(found)]
+
+    def read(self, turn):
+        """Text of a turn, read from the source file by byte offset."""
+        with open(self.source, "rb") as f:
+            f.seek(turn.offset)
+            return f.read(turn.end - turn.offset).decode("utf-8", "replace")
+
+
+class _Builder:
+    """Single pass over the transcript lines; holds only the current page."""
+
+    def __init__(self, idx):
+        self.idx = idx
+        self.page = 0
+        self.minute = -1
+        self.chair = None
+        self.witnesses = {}       # surname key -> Witness, for the current bloc
+        self.header = None        # witness list being read, until the first turn
+        self.header_offset = 0
+        self.page_breaks = False  # input is form-feed delimited
+        self.page_start = 0       # first turn on the current physical page
+
+    def feed(self, lines):
+        offset = 0
+        for raw in lines:
+            segments = raw.split(b"\f")
+            for n, seg in enumerate(segments):
+                if n:
+                    self.new_page(offset)
+                self.line(seg.decode("utf-8", "replace"), offset)
+                offset += len(seg) + 1
+            offset -= 1
+        self.finish(offset)
+
+    def new_page(self, offset):
+        # A page without a header continues the numbering; if a header turns
+        # up anywhere on the page it is renumbered in set_page()
+        self.page_breaks = True
+        self.page_start = len(self.idx)
+        if self.page:
+            self.page += 1
+        self.idx.page_offset.append(offset)
+        self.idx.page_number.append(self.page)
+
+    def set_page(self, number, offset):
+        idx = self.idx
+        self.page = number
+        if self.page_breaks:
+            # Form feeds mark physical pages and text extraction does not
+            # keep the running header first, so number the whole page
+            idx.page[self.page_start:] = array("I", [number]) * (len(idx) - self.page_start)
+            idx.page_number[-1] = number
+        else:
+            idx.page_offset.append(offset)
+            idx.page_number.append(number)
+
+    def line(self, text, offset):
+        m = _PAGE_HEADER.search(text)
+        if m:
+            self.set_page(int(m.group(1)), offset + len(text[:m.start()].encode()))
+            text = text[:m.start()]
+        stripped = text.strip()
+        if not stripped:
+            return
+        ts = _TIMESTAMP.match(stripped)
+        if ts:
+            self.minute = int(ts.group(1)) * 60 + int(ts.group(2))
+            self.idx.time_offset.append(offset)
+            self.idx.time_minute.append(self.minute)
+            return
+        if self.page and not _DOT_LEADER.search(stripped):
+            w = parse_witness(stripped)
+            if w:
+                if self.header is None:
+                    self.header, self.header_offset = [], offset
+                self.header.append(w)
+                return
+            if self.header and len(self.header[-1].description) > 40 and ":" not in stripped \
+                    and len(stripped) < 70 and not stripped.startswith("Committee"):
+                # wrapped header line: '...Department of Climate' / 'Change, Energy, ...'
+                last = self.header[-1]
+                self.header[-1] = last._replace(description=f"{last.description} {stripped}")
+                return
+        m = _TURN.match(text)
+        if m:
+            self.turn(m, offset)
+
+    def turn(self, m, offset):
+        idx = self.idx
+        if self.header is not None:
+            idx.blocs.append(Bloc(len(idx.blocs), self.header, len(idx), self.header_offset))
+            self.witnesses = {w.surname.lower(): w for w in self.header}
+            self.header = None
+        who = m["who"]
+        if who.upper().endswith("CHAIR") or m["chair"]:
+            if m["chair"]:
+                self.chair = _name_case(m["chair"])
+            name, role = self.chair or "CHAIR", "Chair"
+        elif who.startswith("Senator "):
+            name, role = "Senator " + _name_case(who[8:]), "Senator"
+        else:
+            w = self.witnesses.get(_surname_key(who))
+            name, role = (w.name, w.description) if w else (_name_case(who), "")
+        idx._add_turn(name, role, self.page, self.minute, offset)
+
+    def finish(self, size):
+        idx = self.idx
+        idx.size = size
+        for i, bloc in enumerate(idx.blocs):
+            nxt = idx.blocs[i + 1].first_turn if i + 1 < len(idx.blocs) else len(idx)
+            bloc.last_turn = nxt - 1
+            if nxt > bloc.first_turn:
+                bloc.start_page = idx.page[bloc.first_turn]
+                bloc.end_page = idx.page[nxt - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index speaker turns in a Hansard transcript.")
+    parser.add_argument("transcript", help="PDF, DOCX or plain-text transcript (form feeds between pages)")
+    parser.add_argument("--speaker")
+    parser.add_argument("--pages", help="Hansard page range, e.g. 68-85")
+    parser.add_argument("--blocs", action="store_true", help="list witness blocs")
+    parser.add_argument("--parties", help="JSON file mapping speaker or surname to party")
+    args = parser.parse_args(argv)
+
+    parties = None
+    if args.parties:
+        with open(args.parties, encoding="utf-8") as f:
+            parties = json.load(f)
+    idx = HansardIndex.from_file(args.transcript, parties)
+    if args.blocs:
+        for b in idx.blocs:
+            print(f"{b.index + 1}. {b.hansard_range}")
+            for w in b.witnesses:
+                print(f"     {w.line}")
+        return
+    pages = None
+    if args.pages:
+        lo, _, hi = args.pages.partition("-")
+        pages = (int(lo), int(hi or lo))
+    for t in idx.turns(args.speaker, pages):
+        party = f" ({t.party})" if t.party else ""
+        print(f"p. {t.page:<4} {t.speaker}{party}  @{t.offset}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Timing spans, counters and optional profiling for the render pipeline.
+
+    tracer = instrument.enable(memory=True, profile=True)
+    render_briefing(...)
+    instrument.disable()
+    tracer.write("trace.json", "chrome")
+
+populate_template opens a span around each phase (skeleton clone, cover,
+each body unit – one per Part B section – each table build and the save)
+and template_cache around the template load and strip; the helpers count
+the paragraphs, runs and table cells they create. Output is a JSON
+summary (spans, per-name totals, counts, memory and profile tops) or the
+Chrome trace event format, which chrome://tracing and Perfetto load.
+
+Nothing is recorded until enable(): span() then returns one shared no-op
+context manager and count() returns at once, so a disabled hook costs a
+function call.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+
+TOP = 20    # allocation sites and functions kept in the JSON summary
+
+_NULL = nullcontext()
+_tracer = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start", "mem")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        if self.tracer.memory:
+            self.mem = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        tracer = self.tracer
+        args = {k: v for k, v in self.args.items() if v is not None}
+        if tracer.memory:
+            args["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - self.mem) / 1024, 1)
+        tracer.events.append({"name": self.name, "cat": self.cat,
+                              "ts": (self.start - tracer.t0) / 1000,
+                              "dur": (end - self.start) / 1000,
+                              "tid": threading.get_ident(), "args": args})
+
+
+class Tracer:
+    """Spans and counts recorded in this process since enable()."""
+
+    def __init__(self, memory=False, profile=False):
+        self.memory = memory
+        self.profiler = cProfile.Profile() if profile else None
+        self.events = []
+        self.counts = Counter()
+        self.peak_kb = None
+        self.allocations = []
+        self.pid = os.getpid()
+        self.t0 = time.perf_counter_ns()
+        self._own_tracemalloc = False
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        if self.profiler:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        if self.memory:
+            self.peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:TOP]
+            self.allocations = [{"site": str(s.traceback[0]), "kb": round(s.size / 1024, 1),
+                                 "blocks": s.count} for s in stats]
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+
+    # ── Output ──
+
+    def totals(self):
+        """Per span name: calls, total and max duration (ms)."""
+        out = {}
+        for e in self.events:
+            t = out.setdefault(e["name"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            t["calls"] += 1
+            t["total_ms"] += e["dur"] / 1000
+            t["max_ms"] = max(t["max_ms"], e["dur"] / 1000)
+        for t in out.values():
+            t["total_ms"] = round(t["total_ms"], 3)
+            t["max_ms"] = round(t["max_ms"], 3)
+        return out
+
+    def functions(self):
+        """The profile's top functions by cumulative time."""
+        if not self.profiler:
+            return []
+        stats = pstats.Stats(self.profiler).stats
+        top = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:TOP]
+        return [{"function": f"{os.path.basename(file)}:{line}({func})", "calls": nc,
+                 "tottime_ms": round(tt * 1000, 3), "cumtime_ms": round(ct * 1000, 3)}
+                for (file, line, func), (cc, nc, tt, ct, callers) in top]
+
+    def to_json(self):
+        out = {"pid": self.pid, "totals": self.totals(), "counts": dict(self.counts),
+               "spans": self.events}
+        if self.memory:
+            out["memory"] = {"peak_kb": self.peak_kb, "top_allocations": self.allocations}
+        if self.profiler:
+            out["profile"] = self.functions()
+        return out
+
+    def to_chrome(self):
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                   "args": {"name": "populate_template"}}]
+        events += [{**e, "ph": "X", "pid": self.pid} for e in self.events]
+        if self.counts:
+            end = max((e["ts"] + e["dur"] for e in self.events), default=0)
+            events.append({"name": "created", "ph": "C", "ts": end, "pid": self.pid,
+                           "args": dict(self.counts)})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path, fmt="json"):
+        data = self.to_chrome() if fmt == "chrome" else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=None if fmt == "chrome" else 2)
+            f.write("\n")
+
+    def report(self, file=sys.stderr):
+        for name, t in sorted(self.totals().items(), key=lambda kv: -kv[1]["total_ms"]):
+            print(f"{name:<28} {t['calls']:>6} {t['total_ms']:>10.1f} ms"
+                  f" (max {t['max_ms']:.1f})", file=file)
+        if self.counts:
+            print("created: " + ", ".join(f"{v:,} {k}" for k, v in self.counts.items()),
+                  file=file)
+        if self.peak_kb is not None:
+            print(f"traced memory peak: {self.peak_kb / 1024:.1f} MB", file=file)
+
+
+# ── Hooks ──
+
+def span(name, cat=None, **args):
+    """Context manager timing the block as `name` (category `cat`, default
+    the part of `name` before the first dot); None-valued args are dropped."""
+    if _tracer is None:
+        return _NULL
+    return _Span(_tracer, name, cat or name.split(".", 1)[0], args)
+
+def count(key, n=1):
+    if _tracer is not None:
+        _tracer.counts[key] += n
+
+def enabled():
+    return _tracer is not None
+
+def enable(memory=False, profile=False):
+    """Start recording (with tracemalloc and cProfile if asked); returns the Tracer."""
+    global _tracer
+    if _tracer is not None:
+        raise RuntimeError("instrumentation is already enabled")
+    _tracer = Tracer(memory, profile)
+    _tracer.start()
+    return _tracer
+
+def disable():
+    """Stop recording; returns the Tracer (None if it was not enabled)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.stop()
+    return tracer
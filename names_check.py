@@ -0,0 +1,401 @@
+"""
+Name, title, role and organisation consistency across briefings.
+
+    python names_check.py briefings/ [-s sources/] [--json]
+
+Builds a gazetteer of the people in each briefing – witnesses from the
+Part B witness cells, senators from the text – and, when the hearing's
+transcript is in sources/, the witness-bloc headers and speakers Hansard
+records. Every string in the briefing is then scanned once against it:
+
+  * witness lines whose given name, title, role or organisation differs
+    from the transcript (organisations may be abbreviated: "ACF", "MCA");
+  * mentions with a different given name ("Elle Lawless" when the
+    gazetteer has only "Eleanor Lawless") or title ("Dr" for a professor,
+    "Senator" for a witness);
+  * names in witness, senator and speaker fields that are near-misses for
+    a known surname ("O'Shannassy");
+  * the same person with a different organisation in another briefing.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+
+from briefing_spec import find_specs, load_briefing
+from hansard import HansardIndex, find_transcripts, organisation
+
+Issue = namedtuple("Issue", "kind spec where text detail")
+
+_FOLD = (("\u2018", "'"), ("\u2019", "'"), ("\u2013", "-"), ("\u2014", "-"))
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z'\u2019\-]*")
+_PREV_WORD = re.compile(r"([A-Za-z][A-Za-z'\-]*)\.?\s+$")
+_TITLED = re.compile(r"(?<![\w'\-])(Senators?|Mr|Ms|Mrs|Miss|Dr|Prof|Professor|Hon)\.?\s+([A-Z][A-Za-z'\-]*)")
+_BRACKETS = re.compile(r"\[[^\]]*\]|\([^)]*\)")
+_ALIAS = re.compile(r"\(([^)]+)\)")
+_TITLES = {"mr": "Mr", "ms": "Ms", "mrs": "Mrs", "miss": "Miss", "mx": "Mx", "dr": "Dr",
+           "prof": "Professor", "professor": "Professor", "hon": "Hon"}
+_HONOURS = {"AC", "AO", "AM", "OAM", "PSM", "APM", "QC", "SC", "KC"}
+_SENATOR = {"senator", "senators"}
+_STOPWORDS = {"of", "for", "and", "the", "&", "at", "in", "on", "to"}
+# Capitalised words that may sit directly before a surname without being a given name
+_NOT_GIVEN = {"Minister", "Chair", "Deputy", "Secretary", "Acting", "Committee", "Professor",
+              "The", "And", "By", "From", "With", "To", "Per", "Mr", "Ms", "Mrs", "Dr", "Prof"}
+
+
+def _fold_quotes(s):
+    # Same length in and out, so offsets into the folded text still apply
+    for a, b in _FOLD:
+        s = s.replace(a, b)
+    return s
+
+
+def _fold(s):
+    return " ".join(_fold_quotes(s).split())
+
+
+def _key(surname):
+    return _fold(surname).lower()
+
+
+def _words(phrase):
+    return [w for w in re.findall(r"[A-Za-z0-9']+", _fold(phrase)) if w.lower() not in _STOPWORDS]
+
+
+def _word_eq(a, b):
+    a, b = a.lower(), b.lower()
+    return a == b or (min(len(a), len(b)) >= 5 and (a.startswith(b) or b.startswith(a)))
+
+
+def phrase_match(short, full):
+    """True if `short` reads as a (possibly abbreviated) subsequence of
+    `full`: 'ACF' ~ 'Australian Conservation Foundation', 'CEO' ~ 'Chief
+    Executive Officer', 'WWF Australia' ~ 'World Wide Fund for Nature
+    Australia'."""
+    b = _words(full)
+    j = 0
+    for t in _words(short):
+        k = next((k for k in range(j, len(b)) if _word_eq(t, b[k])), None)
+        if k is None and t.isupper() and len(t) >= 2:
+            n = len(t)
+            k = next((k for k in range(j, len(b) - n + 1)
+                      if "".join(w[0] for w in b[k:k + n]).lower() == t.lower()), None)
+            if k is not None:
+                k += n - 1
+        if k is None:
+            return False
+        j = k + 1
+    return True
+
+
+class Person:
+    __slots__ = ("surname", "given", "aliases", "title", "description", "senator", "source")
+
+    def __init__(self, surname, given="", aliases=(), title="", description="",
+                 senator=False, source=""):
+        self.surname = surname
+        self.given = given
+        self.aliases = set(aliases)
+        self.title = title
+        self.description = description
+        self.senator = senator
+        self.source = source
+
+    @property
+    def name(self):
+        alias = "".join(f" ({a})" for a in sorted(self.aliases))
+        prefix = "Senator " if self.senator else ""
+        return f"{prefix}{self.given}{alias} {self.surname}".replace("  ", " ").strip()
+
+    def given_names(self):
+        names = set(self.given.split()) | self.aliases
+        return {n.lower() for n in names}
+
+    @property
+    def organisation(self):
+        return organisation(_BRACKETS.sub("", self.description))
+
+
+def parse_person(line, source=""):
+    """'Prof. Graeme Samuel AC, private capacity (author ...)' -> Person."""
+    name, _, description = _fold(line).partition(",")
+    aliases = _ALIAS.findall(name)
+    tokens = _ALIAS.sub("", name).split()
+    title = ""
+    while tokens and tokens[0].rstrip(".").lower() in _TITLES:
+        title = _TITLES[tokens.pop(0).rstrip(".").lower()]
+    while len(tokens) > 1 and tokens[-1] in _HONOURS:
+        tokens.pop()
+    if not tokens:
+        return None
+    description = _BRACKETS.sub("", description)
+    return Person(tokens[-1], " ".join(tokens[:-1]), aliases, title,
+                  " ".join(description.replace(" ,", ",").split()).strip(" ,"), source=source)
+
+
+class Gazetteer:
+    """People by folded surname, plus a single-deletion neighbourhood of
+    every surname for near-miss spellings."""
+
+    def __init__(self):
+        self.people = {}
+        self._near = {}
+
+    def add(self, person):
+        key = _key(person.surname)
+        self.people.setdefault(key, []).append(person)
+        if len(key) >= 5:
+            for v in {key} | {key[:i] + key[i + 1:] for i in range(len(key))}:
+                self._near.setdefault(v, set()).add(key)
+        return person
+
+    def lookup(self, surname):
+        return self.people.get(_key(surname), [])
+
+    def near(self, token):
+        """Known surnames one edit from `token` (which is not itself known),
+        as spelled in the gazetteer."""
+        key = _key(token)
+        if len(key) < 5 or key in self.people:
+            return set()
+        found = set()
+        for v in {key} | {key[:i] + key[i + 1:] for i in range(len(key))}:
+            found |= self._near.get(v, set())
+        return {self.people[k][0].surname for k in found}
+
+    def senator(self, surname, source=""):
+        for p in self.lookup(surname):
+            if p.senator:
+                return p
+        return self.add(Person(surname, senator=True, source=source))
+
+
+def _excerpt(text, start, end, width=40):
+    lo, hi = max(0, start - width), min(len(text), end + width)
+    return f"{'...' if lo else ''}{text[lo:hi]}{'...' if hi < len(text) else ''}"
+
+
+def _strings(obj, path=""):
+    """(path, string) for every string in a spec dict, in document order."""
+    if isinstance(obj, str):
+        yield path, obj
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _strings(v, f"{path}.{k}" if path else k)
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            yield from _strings(v, f"{path}[{i}]")
+
+
+def hansard_gazetteer(transcripts):
+    """Witnesses and senators as recorded in a hearing's transcripts."""
+    gaz = Gazetteer()
+    for path in transcripts:
+        idx = HansardIndex.from_file(path)
+        for bloc in idx.blocs:
+            for w in bloc.witnesses:
+                aliases = _ALIAS.findall(w.given)
+                given = " ".join(_ALIAS.sub("", w.given).split())
+                gaz.add(Person(w.surname, given, aliases, _TITLES.get(
+                    w.title.rstrip(".").lower(), w.title), w.description, source=path))
+        for name in idx.speakers():
+            if name.startswith("Senator "):
+                parts = name.split()
+                s = gaz.senator(parts[-1], path)
+                s.given = " ".join(parts[1:-1])
+    return gaz
+
+
+class Checker:
+    """Consistency pass over one briefing; issues are appended to `issues`."""
+
+    def __init__(self, spec, data, hansard=None):
+        self.spec = spec
+        self.data = data
+        self.issues = []
+        self.gaz = Gazetteer()
+        self.hansard = hansard or Gazetteer()   # people as the transcript records them
+        self.witnesses = []             # (where, line, Person) from Part B witness cells
+        for i, sec in enumerate(data.get("sections", [])):
+            for j, line in enumerate(sec.get("witnesses", "").splitlines()):
+                p = parse_person(line, spec)
+                if p:
+                    self.witnesses.append((f"sections[{i}].witnesses[{j}]", line, p))
+                    self.gaz.add(p)
+        for key, people in self.hansard.people.items():
+            if key not in self.gaz.people:
+                for p in people:
+                    self.gaz.add(p)
+            elif any(p.senator for p in people):
+                self.gaz.senator(people[0].surname, people[0].source)
+
+    def flag(self, kind, where, text, detail):
+        self.issues.append(Issue(kind, self.spec, where, text, detail))
+
+    def run(self):
+        strings = list(_strings(self.data))
+        self.collect_senators(strings)
+        self.check_witnesses()
+        for where, text in strings:
+            if where.endswith(".senator"):
+                self.check_name_field(where, text, senator=True)
+            elif where.endswith((".witness", ".speaker")):
+                self.check_name_field(where, text)
+                if where.endswith(".speaker"):
+                    self.check_descriptor(where, text)
+        self.check_mentions(strings)
+        return self.issues
+
+    def collect_senators(self, strings):
+        # 'Senator Grogan', 'Senators Hanson-Young, Grogan, Pocock, and Henderson'
+        for _, text in strings:
+            for m in re.finditer(r"\bSenators?\s+((?:[A-Z][\w'’\-]+(?:,\s*|\s+and\s+|\s*)){1,12})", text):
+                for name in re.findall(r"[A-Z][\w'’\-]+", m.group(1)):
+                    if not self.gaz.lookup(name) or any(p.senator for p in self.gaz.lookup(name)):
+                        self.gaz.senator(name, self.spec)
+
+    def check_witnesses(self):
+        if not self.hansard.people:
+            return
+        for where, line, p in self.witnesses:
+            found = self.hansard.lookup(p.surname)
+            if not found:
+                near = self.hansard.near(p.surname)
+                detail = (f"not in the transcript's witness lists; did you mean "
+                          f"{' or '.join(sorted(near))}?" if near
+                          else "not in the transcript's witness lists")
+                self.flag("spelling" if near else "unknown", where, line, detail)
+                continue
+            h = found[0]
+            if p.given and h.given and not (p.given_names() & h.given_names()):
+                self.flag("name", where, line, f"transcript has {h.name}")
+            if p.title and h.title and p.title != h.title:
+                self.flag("title", where, line, f"transcript has {h.title} {h.surname}")
+            if p.description and h.description and not phrase_match(p.description, h.description):
+                parts = [s.strip() for s in p.description.split(",") if s.strip()]
+                bad = next((s for s in parts if not phrase_match(s, h.description)), p.description)
+                kind = "organisation" if bad == parts[-1] else "role"
+                self.flag(kind, where, line, f"{bad!r} does not match transcript: {h.description}")
+
+    def check_descriptor(self, where, text):
+        # 'Kelly O'Shanassy, ACF' – the part after the name must fit the gazetteer entry
+        p = parse_person(text)
+        if not p or not p.description:
+            return
+        for known in self.gaz.lookup(p.surname):
+            if known.description:
+                if not phrase_match(p.description, known.description):
+                    self.flag("organisation", where, text,
+                              f"{p.description!r} does not match {known.name}, {known.description}")
+                return
+
+    def check_name_field(self, where, text, senator=False):
+        for m in _TOKEN.finditer(_ALIAS.sub(lambda a: a.group().replace("(", " "), text)):
+            token = m.group()
+            if not token[0].isupper() or token.isupper() or token.lower() in _TITLES:
+                continue
+            people = self.gaz.lookup(token)
+            if senator and people and not any(p.senator for p in people):
+                self.flag("senator", where, text, f"{token} is not a senator ({people[0].name})")
+            elif not people:
+                near = self.gaz.near(token)
+                if near:
+                    self.flag("spelling", where, text,
+                              f"{token!r} is not a known name; did you mean "
+                              f"{' or '.join(sorted(near))}?")
+
+    def check_mentions(self, strings):
+        # Scan the whole briefing as one string; NUL separators keep matches
+        # inside a field, and bisect maps an offset back to its field
+        starts, pos = [], 0
+        for _, text in strings:
+            starts.append(pos)
+            pos += len(text) + 1
+        blob = _fold_quotes("\0".join(text for _, text in strings))
+
+        def field(offset):
+            i = bisect_right(starts, offset) - 1
+            return strings[i][0], strings[i][1], starts[i]
+
+        surnames = sorted({p.surname for ps in self.gaz.people.values() for p in ps},
+                          key=len, reverse=True)
+        if surnames:
+            names = re.compile(r"(?<![\w'\-])(?:%s)(?![\w'\-])" % "|".join(map(re.escape, surnames)))
+            for m in names.finditer(blob):
+                before = _PREV_WORD.search(blob, max(0, m.start() - 40), m.start())
+                if before:
+                    where, text, base = field(m.start())
+                    self.check_prefix(where, _excerpt(text, before.start() - base, m.end() - base),
+                                      before.group(1), m.group(), self.gaz.lookup(m.group()))
+        for m in _TITLED.finditer(blob):
+            near = self.gaz.near(m.group(2))
+            if near:
+                where, text, base = field(m.start())
+                self.flag("spelling", where, _excerpt(text, m.start() - base, m.end() - base),
+                          f"{m.group(2)!r} is not a known name; did you mean "
+                          f"{' or '.join(sorted(near))}?")
+
+    def check_prefix(self, where, text, before, surname, people):
+        low = before.lower()
+        if low in _SENATOR:
+            if not any(p.senator for p in people):
+                self.flag("title", where, text, f"'{before} {surname}': {people[0].name} is not a senator")
+        elif low in _TITLES:
+            title = _TITLES[low]
+            titled = [p for p in people if p.title and not p.senator]
+            if titled and all(p.title != title for p in titled) and {title, titled[0].title} & {"Dr", "Professor"}:
+                self.flag("title", where, text, f"'{before} {surname}': gazetteer has {titled[0].title} {titled[0].surname}")
+        elif before[0].isupper() and not before.isupper() and before not in _NOT_GIVEN:
+            given = {g for p in people for g in p.given_names()}
+            if given and before.lower() not in given:
+                names = " / ".join(p.name for p in people)
+                self.flag("name", where, text, f"'{before} {surname}': gazetteer has {names}")
+
+
+def check_archive(spec_paths, sources=None):
+    """Issues for every briefing, plus people whose organisation differs
+    between briefings."""
+    issues, seen, hearings = [], {}, {}
+    for path in spec_paths:
+        briefing = load_briefing(path)
+        transcripts = tuple(find_transcripts(sources, briefing.committee_code,
+                                             f"{briefing.hearing_date:%Y%m%d}") if sources else ())
+        if transcripts not in hearings:
+            hearings[transcripts] = hansard_gazetteer(transcripts)
+        checker = Checker(path, briefing.to_dict(), hearings[transcripts])
+        issues.extend(checker.run())
+        for where, line, p in checker.witnesses:
+            key = (p.given.lower(), _key(p.surname))
+            other = seen.setdefault(key, (path, where, p))
+            if other[0] != path and p.organisation and other[2].organisation and not (
+                    phrase_match(p.organisation, other[2].organisation)
+                    or phrase_match(other[2].organisation, p.organisation)):
+                issues.append(Issue("organisation", path, where, line,
+                                    f"{other[0]} has {other[2].organisation!r}"))
+    return issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check names, titles, roles and organisations.")
+    parser.add_argument("specs", nargs="+", help="spec files or directories")
+    parser.add_argument("-s", "--sources", default="sources",
+                        help="transcripts directory ('' to check specs only)")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    sources = args.sources if args.sources and os.path.isdir(args.sources) else None
+    issues = check_archive(find_specs(args.specs), sources)
+    if args.json:
+        json.dump([i._asdict() for i in issues], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for i in issues:
+            print(f"{i.kind:<12} {i.where}: {i.detail}\n{'':<13}{i.text[:100]}")
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Verify Part C key quotes against the hearing transcript.
+
+    python quote_check.py briefings/ECLC_HIB_003_20251114.json [-s sources/]
+    python quote_check.py briefings/ECLC_HIB_003_20251114.json transcript.txt --json
+
+Every quote in the spec is looked up in one pass over each transcript:
+a word-level Aho-Corasick automaton finds verbatim occurrences, and quotes
+with no exact hit fall back to word-trigram overlap, which tolerates
+transcription noise, split words and curly-quote differences. Each quote
+is reported with its Hansard page, time and speaker, or flagged as a
+paraphrase when only part of the wording is in the transcript. A quote
+with ellipses is verbatim only when its fragments occur in order, each
+within ELISION_GAP words of the last and on the same or the next page;
+fragments that are all present but scattered make it partial.
+"""
+import argparse
+import json
+import re
+import sys
+from collections import Counter, deque
+
+from briefing_spec import load_briefing
+from hansard import HansardIndex, _PAGE_HEADER, _surname_key, find_transcripts, format_minute
+
+VERBATIM, NEAR, PARTIAL, PARAPHRASE, NOT_FOUND = (
+    "verbatim", "near-verbatim", "partial", "paraphrase", "not found")
+FLAGGED = (PARTIAL, PARAPHRASE, NOT_FOUND)
+NEAR_SCORE = 0.75       # share of the quote's word trigrams found together
+PARAPHRASE_SCORE = 0.3
+ELISION_GAP = 60        # most words an ellipsis may stand for
+
+_FOLD = str.maketrans({"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+                       "\u2013": "-", "\u2014": "-"})
+_WORD = re.compile(r"[0-9a-z]+")
+_ELISION = re.compile(r"\.\.\.|…|\[[^\]]*\]")
+_RUNNING_HEAD = re.compile(r"^[A-Z ,&'\-]+$")
+
+
+def words(text):
+    return _WORD.findall(text.translate(_FOLD).lower())
+
+
+def quote_fragments(quote):
+    """Word lists for the verbatim parts of a quote, split at ellipses
+    and [editorial insertions]."""
+    return [w for w in (words(part) for part in _ELISION.split(quote)) if w]
+
+
+def _ngrams(seq, n):
+    return [tuple(seq[i:i + n]) for i in range(len(seq) - n + 1)]
+
+
+class WordMatcher:
+    """Aho-Corasick automaton over word sequences."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for w in pattern:
+                nxt = self.goto[state].get(w)
+                if nxt is None:
+                    nxt = self.goto[state][w] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pid)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for w, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and w not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(w, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def step(self, state, w):
+        """Advance by one word; returns (state, matched pattern ids)."""
+        goto, fail = self.goto, self.fail
+        while state and w not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(w, 0)
+        return state, self.out[state]
+
+
+def _transcript_words(path):
+    """(word, byte offset of its line, page sheet) for the spoken text,
+    skipping running heads so a quote that crosses a page break still
+    matches. Sheets count form feeds from 0."""
+    offset = sheet = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            for i, seg in enumerate(raw.split(b"\f")):
+                sheet += bool(i)
+                text = seg.decode("utf-8", "replace")
+                text = _PAGE_HEADER.sub("", text)
+                if not _RUNNING_HEAD.match(text.strip() or "x"):
+                    for w in words(text):
+                        yield w, offset, sheet
+                offset += len(seg) + 1
+            offset -= 1
+
+
+def _in_order(occurrences):
+    """Offset of the first fragment of a chain taking one occurrence
+    (start, end, sheet, offset) of each fragment in turn, each starting at
+    most ELISION_GAP words after the previous one ends, all on the same or
+    adjacent sheets; None when there is no such chain."""
+    # per occurrence of the current fragment: the latest-starting chain
+    # ending there, as (start word, sheet, offset) of its first fragment
+    chains = [(o[0], o[2], o[3]) for o in occurrences[0]]
+    prev = occurrences[0]
+    for occ in occurrences[1:]:
+        nxt = []
+        for start, _end, sheet, _offset in occ:
+            best = None
+            for p, head in zip(prev, chains):
+                if (head is not None and p[1] <= start <= p[1] + ELISION_GAP
+                        and sheet - head[1] <= 1 and (best is None or head[0] > best[0])):
+                    best = head
+            nxt.append(best)
+        prev, chains = occ, nxt
+    return max((c for c in chains if c is not None), default=(None, None, None))[2]
+
+
+def _best_window(hits, n_grams, width):
+    """Largest share of distinct quote trigrams within `width` words;
+    returns (score, offset of the window start)."""
+    best, at = 0.0, None
+    seen = Counter()
+    lo = 0
+    for hi, (pos, offset, gram) in enumerate(hits):
+        seen[gram] += 1
+        while pos - hits[lo][0] > width:
+            g = hits[lo][2]
+            seen[g] -= 1
+            if not seen[g]:
+                del seen[g]
+            lo += 1
+        score = len(seen) / n_grams
+        if score > best:
+            best, at = score, hits[lo][1]
+    return best, at
+
+
+def scan(path, quotes):
+    """Locate each quote (a string) in one transcript. Returns a list of
+    (status, score, byte offset or None) per quote."""
+    fragments = [quote_fragments(q) for q in quotes]
+    patterns, owner = [], []
+    for qid, frags in enumerate(fragments):
+        for k, frag in enumerate(frags):
+            patterns.append(frag)
+            owner.append((qid, k))
+    matcher = WordMatcher(patterns)
+    grams = {}
+    n_grams = []
+    for qid, frags in enumerate(fragments):
+        qgrams = {g for frag in frags for g in _ngrams(frag, 3)} or {tuple(sum(frags, []))}
+        n_grams.append(len(qgrams))
+        for g in qgrams:
+            grams.setdefault(g, []).append(qid)
+
+    # per quote and fragment: (start word, end word, sheet, offset) of each occurrence
+    found = [[[] for _ in frags] for frags in fragments]
+    hits = [[] for _ in quotes]            # (word position, offset, trigram)
+    recent = deque(maxlen=max((len(p) for p in patterns), default=1))
+    window = deque(maxlen=3)
+    state = 0
+    for pos, (w, offset, sheet) in enumerate(_transcript_words(path)):
+        recent.append((offset, sheet))
+        window.append(w)
+        state, matched = matcher.step(state, w)
+        for pid in matched:
+            start, start_sheet = recent[-len(patterns[pid])]
+            qid, k = owner[pid]
+            found[qid][k].append((pos + 1 - len(patterns[pid]), pos + 1, start_sheet, start))
+        for qid in grams.get(tuple(window), ()):
+            hits[qid].append((pos, offset, tuple(window)))
+
+    results = []
+    for qid, frags in enumerate(fragments):
+        complete = frags and all(found[qid])
+        if complete:
+            offset = _in_order(found[qid])
+            if offset is not None:
+                results.append((VERBATIM, 1.0, offset))
+                continue
+        length = sum(len(f) for f in frags)
+        score, offset = _best_window(hits[qid], n_grams[qid], length + length // 2 + 5)
+        if complete:
+            # every fragment is there, but not together and in order
+            status, offset = PARTIAL, offset if offset is not None else found[qid][0][0][3]
+        elif score >= NEAR_SCORE:
+            status = NEAR
+        elif score >= PARAPHRASE_SCORE:
+            status = PARAPHRASE
+        else:
+            status, offset = NOT_FOUND, None
+        results.append((status, round(score, 2), offset))
+    return results
+
+
+def _cited_page(pages):
+    m = re.search(r"\d+", pages or "")
+    return int(m.group()) if m else None
+
+
+def check_quotes(briefing, transcripts):
+    """One result dict per Part C quote, using the best match across the
+    hearing's transcripts."""
+    texts = [q.quote for q in briefing.quotes]
+    best = [(NOT_FOUND, 0.0, None, None, None)] * len(texts)
+    for path in transcripts:
+        idx = HansardIndex.from_file(path)
+        for i, (status, score, offset) in enumerate(scan(idx.source, texts)):
+            if score > best[i][1]:
+                best[i] = (status, score, offset, idx, path)
+
+    results = []
+    for q, (status, score, offset, idx, path) in zip(briefing.quotes, best):
+        r = {"speaker": q.speaker, "quote": q.quote, "cited": q.pages,
+             "status": status, "score": score}
+        if offset is not None:
+            page = idx.page_at(offset)
+            turn = idx.turn_at(offset)
+            said_by = idx.turn(turn).speaker if turn is not None else ""
+            r.update(page=page, citation=f"p. {page}", time=format_minute(idx.minute_at(offset)),
+                     transcript=path, said_by=said_by,
+                     speaker_ok=set(words(_surname_key(said_by))) <= set(words(q.speaker)),
+                     citation_ok=_cited_page(q.pages) == page and "approx" not in q.pages)
+        results.append(r)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check Part C quotes against the transcript.")
+    parser.add_argument("spec")
+    parser.add_argument("transcripts", nargs="*",
+                        help="PDF, DOCX or text transcripts (default: matching files in sources/)")
+    parser.add_argument("-s", "--sources", default="sources")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    briefing = load_briefing(args.spec)
+    transcripts = args.transcripts or find_transcripts(
+        args.sources, briefing.committee_code, f"{briefing.hearing_date:%Y%m%d}")
+    if not transcripts:
+        sys.exit(f"No transcript for {briefing.committee_code} {briefing.hearing_date} in {args.sources}")
+    results = check_quotes(briefing, transcripts)
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for r in results:
+            where = f"{r['citation']} {r['time']}".strip() if "page" in r else "-"
+            notes = []
+            if "page" in r and not r["citation_ok"]:
+                notes.append(f"cited {r['cited']!r}")
+            if "page" in r and not r["speaker_ok"]:
+                notes.append(f"said by {r['said_by']}")
+            print(f"{r['status']:<14} {where:<14} {r['speaker']}" + (f"  ({'; '.join(notes)})" if notes else ""))
+    return 1 if any(r["status"] in FLAGGED for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+"""
+Register of questions on notice and forward action items across hearings.
+
+    python register.py import out/ briefings/      # back-fill from _HIB_ DOCX files and specs
+    python register.py qon --senator Henderson --outstanding
+    python register.py actions --priority HIGH --due week
+
+Every render records its Table 1 questions on notice (plus any "QoN n –
+Senator: ...; outstanding" L4 bullets missing from Table 1) and its Table 3
+action items in a local SQLite store, register.sqlite. The same question
+asked of the same witness by the same senator is one record however many
+briefings list it: records are keyed on their normalised text, senator and
+witness, and take their status, priority and due date from the latest
+hearing that lists them. Re-rendering a briefing replaces what that
+hearing contributed.
+
+Due dates are read from the status or timeframe cell where one is given
+("due 12 December 2025", "within 2 weeks" of the hearing); items with no
+readable date have none and only match date queries with --due none.
+"""
+import argparse
+import calendar
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import unicodedata
+from datetime import date, datetime, timedelta
+
+from briefing_ir import LAYER_TITLES
+from briefing_spec import LAYERS, load_briefing
+from docx_package import iter_body
+from validate import find_targets
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(BASE, "register.sqlite")
+HIB_NAME = re.compile(r"^(?P<committee>[A-Za-z]+)_HIB_(?P<number>\d+)_(?P<date>\d{8})")
+PRIORITIES = ("HIGH", "MEDIUM", "LOW")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hearings (
+    hearing      TEXT PRIMARY KEY,      -- ECLC_HIB_003_20251114
+    committee    TEXT NOT NULL,
+    hearing_date TEXT NOT NULL,
+    source       TEXT,
+    recorded     TEXT NOT NULL
+);
+-- One row per distinct question or action; the descriptive columns are
+-- copied from its latest sighting
+CREATE TABLE IF NOT EXISTS items (
+    id           INTEGER PRIMARY KEY,
+    kind         TEXT NOT NULL,          -- 'qon' or 'action'
+    key          TEXT NOT NULL UNIQUE,
+    senator_key  TEXT NOT NULL,
+    committee    TEXT,
+    text         TEXT,
+    senator      TEXT,
+    witness      TEXT,
+    owner        TEXT,
+    number       TEXT,
+    status       TEXT,
+    priority     TEXT,
+    timeframe    TEXT,
+    due          TEXT,
+    outstanding  INTEGER,
+    first_date   TEXT,
+    last_hearing TEXT,
+    last_date    TEXT,
+    hearings     INTEGER
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    item_id      INTEGER NOT NULL REFERENCES items(id),
+    hearing      TEXT NOT NULL REFERENCES hearings(hearing),
+    hearing_date TEXT NOT NULL,
+    text         TEXT,
+    senator      TEXT,
+    witness      TEXT,
+    owner        TEXT,
+    number       TEXT,
+    status       TEXT,
+    priority     TEXT,
+    timeframe    TEXT,
+    due          TEXT,
+    PRIMARY KEY (item_id, hearing)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sightings_hearing ON sightings(hearing);
+CREATE INDEX IF NOT EXISTS items_qon ON items(kind, outstanding, senator_key);
+CREATE INDEX IF NOT EXISTS items_due ON items(kind, priority, due);
+"""
+
+# Columns copied from a sighting into its item
+_COPIED = ("text", "senator", "witness", "owner", "number", "status", "priority",
+           "timeframe", "due")
+
+
+# ── Normalising and parsing cells ──
+
+def normalise(text):
+    """Lower-case words only: 'DCCEEW officials (Parry/Gaddes)' ->
+    'dcceew officials parry gaddes'."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return " ".join(re.findall(r"[^\W_]+", text.replace("\u2019", "").replace("'", "")))
+
+
+def senator_key(senator):
+    words = [w for w in normalise(senator).split() if w not in ("senator", "senators", "sen")]
+    return " ".join(words)
+
+
+def item_key(kind, *parts):
+    blob = "\0".join([kind] + [normalise(p) for p in parts])
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+_OPEN = re.compile(r"\b(outstanding|pending|overdue|not yet|awaiting|open)\b", re.I)
+_CLOSED = re.compile(r"\b(answered|provided|received|tabled|closed|withdrawn|complete[d]?)\b", re.I)
+
+
+def is_outstanding(status):
+    """A QoN is outstanding unless its status says it was answered."""
+    return bool(_OPEN.search(status or "")) or not _CLOSED.search(status or "")
+
+
+_MONTHS = {m.lower(): i for i, m in enumerate(calendar.month_name) if m}
+_MONTHS.update({m.lower(): i for i, m in enumerate(calendar.month_abbr) if m})
+_ISO = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_DMY = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,9})\.?,?\s+(\d{4})\b")
+_NUMERIC = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+# "within 2 weeks", but not "within 1 week of publication": that counts from
+# an event the register cannot date
+_WITHIN = re.compile(r"\bwithin\s+(\d+|one|two|three|four|six)\s+(day|week|month)s?\b"
+                     r"(?!\s+(?:of|after|from)\b)", re.I)
+_COUNTS = {"one": 1, "two": 2, "three": 3, "four": 4, "six": 6}
+
+
+def _add_months(d, n):
+    y, m = divmod(d.month - 1 + n, 12)
+    return d.replace(year=d.year + y, month=m + 1,
+                     day=min(d.day, calendar.monthrange(d.year + y, m + 1)[1]))
+
+
+def parse_due(text, hearing_date):
+    """Due date named in a status or timeframe cell, or None. Relative
+    timeframes ('Within 2 weeks', 'Immediate') count from the hearing."""
+    text = text or ""
+    try:
+        m = _ISO.search(text)
+        if m:
+            return date(*map(int, m.groups()))
+        m = _DMY.search(text)
+        if m and m[2].lower() in _MONTHS:
+            return date(int(m[3]), _MONTHS[m[2].lower()], int(m[1]))
+        m = _NUMERIC.search(text)
+        if m:  # Australian order
+            return date(int(m[3]), int(m[2]), int(m[1]))
+    except ValueError:
+        return None
+    m = _WITHIN.search(text)
+    if m:
+        n = int(_COUNTS.get(m[1].lower(), m[1]))
+        unit = m[2].lower()
+        if unit == "month":
+            return _add_months(hearing_date, n)
+        return hearing_date + timedelta(days=n * (7 if unit == "week" else 1))
+    if re.match(r"\s*immediate", text, re.I):
+        return hearing_date
+    return None
+
+
+def _qon_due(status, hearing_date):
+    # A date in an answered QoN's status is when it was answered
+    return parse_due(status, hearing_date) if is_outstanding(status) else None
+
+
+# L4 bullet: "QoN 1 – Henderson: copies of all departmental advices ...; outstanding"
+_QON_BULLET = re.compile(
+    r"^QoNs?\s+(?P<number>\d+)\s*[\u2013\u2014-]\s*(?P<senator>[^:]+?)\s*:\s*"
+    r"(?P<question>.+?)(?:;\s*(?P<status>[^;]+))?\s*$")
+
+
+def hearing_items(hearing_date, qons, actions, l4_bullets=()):
+    """Register rows for one hearing from Table 1 rows (number, question,
+    witness, senator, status), Table 3 rows (priority, action, owner,
+    timeframe) and the Part B L4 bullets. A QoN bullet is only used when
+    Table 1 has no row with its number. Cells may be numbers (a QoN number
+    given as an int in the spec) and are compared as strings."""
+    rows = []
+    numbers = set()
+    for number, question, witness, senator, status in (map(str, r) for r in qons):
+        if not question.strip():
+            continue
+        numbers.add(number.strip())
+        rows.append({"kind": "qon", "key": item_key("qon", question, senator, witness),
+                     "text": question, "senator": senator, "witness": witness,
+                     "number": number, "status": status, "due": _qon_due(status, hearing_date)})
+    for bullet in l4_bullets:
+        m = _QON_BULLET.match(bullet.strip())
+        if not m or m["number"] in numbers:
+            continue
+        numbers.add(m["number"])
+        senator = re.sub(r"\s+senators$", "", m["senator"], flags=re.I)
+        status = (m["status"] or "").strip()
+        rows.append({"kind": "qon", "key": item_key("qon", m["question"], senator, ""),
+                     "text": m["question"], "senator": senator, "witness": "",
+                     "number": m["number"], "status": status,
+                     "due": _qon_due(status, hearing_date)})
+    for priority, action, owner, timeframe in (map(str, r) for r in actions):
+        if not action.strip():
+            continue
+        rows.append({"kind": "action", "key": item_key("action", action, owner),
+                     "text": action, "owner": owner, "priority": priority.strip().upper(),
+                     "timeframe": timeframe, "due": parse_due(timeframe, hearing_date)})
+    return rows
+
+
+def read_docx(path):
+    """(Table 1 rows, Table 3 rows, L4 bullets) from a rendered briefing."""
+    qons, actions, bullets = [], [], []
+    part = layer = table = None
+    l4 = LAYER_TITLES["L4"]
+    for block in iter_body(path):
+        if block[0] == "tbl":
+            target = {"1": (qons, 5), "3": (actions, 4)}.get(table)
+            if target:
+                rows, width = target
+                rows.extend(r for r in block[1][1:] if len(r) == width)
+            table = None
+            continue
+        _, style, text, numbered = block
+        if style == "heading 1":
+            part = text[:6]
+        elif style == "heading 3":
+            layer = text == l4
+            m = re.match(r"Table (\d+)", text)
+            table = m.group(1) if m and part == "Part C" else None
+        elif style == "heading 2":
+            layer = False
+        elif numbered and layer and part == "Part B":
+            bullets.append(text)
+    return qons, actions, bullets
+
+
+# ── Store ──
+
+class Register:
+    """The SQLite register at `path`. Safe to share between processes:
+    writers wait for each other rather than failing."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.db.commit()
+        self.close()
+
+    def record(self, hearing, committee, hearing_date, rows, source=None):
+        """Replace everything `hearing` contributed with `rows` (from
+        hearing_items). Does not commit."""
+        db = self.db
+        when = hearing_date.isoformat()
+        touched = {r[0] for r in db.execute(
+            "SELECT item_id FROM sightings WHERE hearing = ?", (hearing,))}
+        db.execute("DELETE FROM sightings WHERE hearing = ?", (hearing,))
+        db.execute("INSERT OR REPLACE INTO hearings VALUES (?, ?, ?, ?, ?)",
+                   (hearing, committee, when, source,
+                    datetime.now().isoformat(timespec="seconds")))
+        for row in rows:
+            db.execute("INSERT INTO items (kind, key, senator_key) VALUES (?, ?, ?) "
+                       "ON CONFLICT(key) DO NOTHING",
+                       (row["kind"], row["key"], senator_key(row.get("senator"))))
+            item_id = db.execute("SELECT id FROM items WHERE key = ?", (row["key"],)).fetchone()[0]
+            touched.add(item_id)
+            due = row.get("due")
+            db.execute(
+                "INSERT OR REPLACE INTO sightings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (item_id, hearing, when, row["text"], row.get("senator"), row.get("witness"),
+                 row.get("owner"), row.get("number"), row.get("status"), row.get("priority"),
+                 row.get("timeframe"), due.isoformat() if due else None))
+        self._refresh(touched)
+
+    def _refresh(self, ids):
+        """Re-derive the summary columns of items `ids` from their sightings;
+        items no hearing lists any more are dropped."""
+        db = self.db
+        for item_id in ids:
+            latest = db.execute(
+                "SELECT s.*, h.committee FROM sightings s JOIN hearings h USING (hearing) "
+                "WHERE item_id = ? ORDER BY s.hearing_date DESC, s.hearing DESC LIMIT 1",
+                (item_id,)).fetchone()
+            if latest is None:
+                db.execute("DELETE FROM items WHERE id = ?", (item_id,))
+                continue
+            first, count = db.execute(
+                "SELECT min(hearing_date), count(*) FROM sightings WHERE item_id = ?",
+                (item_id,)).fetchone()
+            kind = db.execute("SELECT kind FROM items WHERE id = ?", (item_id,)).fetchone()[0]
+            outstanding = is_outstanding(latest["status"]) if kind == "qon" else None
+            db.execute(
+                "UPDATE items SET " + ", ".join(f"{c} = ?" for c in _COPIED) +
+                ", committee = ?, outstanding = ?, first_date = ?, last_hearing = ?,"
+                " last_date = ?, hearings = ? WHERE id = ?",
+                [latest[c] for c in _COPIED] +
+                [latest["committee"], outstanding, first, latest["hearing"],
+                 latest["hearing_date"], count, item_id])
+
+    def record_briefing(self, briefing, source=None):
+        hearing = os.path.splitext(briefing.output_name)[0]
+        rows = hearing_items(briefing.hearing_date,
+                             [q.cells() for q in briefing.questions_on_notice],
+                             [a.cells() for a in briefing.actions],
+                             [b for sec in briefing.sections for b in sec.layer(LAYERS[3])])
+        self.record(hearing, briefing.committee_code, briefing.hearing_date, rows, source)
+        return len(rows)
+
+    def record_docx(self, path):
+        m = HIB_NAME.match(os.path.basename(path))
+        if not m:
+            raise ValueError(f"{path}: not a [COMMITTEE]_HIB_[NNN]_[YYYYMMDD].docx file")
+        when = datetime.strptime(m["date"], "%Y%m%d").date()
+        rows = hearing_items(when, *read_docx(path))
+        hearing = os.path.splitext(os.path.basename(path))[0]
+        self.record(hearing, m["committee"].upper(), when, rows, path)
+        return len(rows)
+
+    def query(self, kind, senator=None, witness=None, committee=None, outstanding=None,
+              priority=None, due_from=None, due_to=None, no_due=False, text=None):
+        """Matching items as dicts, soonest due first, then latest hearing."""
+        where, args = ["kind = ?"], [kind]
+        if outstanding is not None:
+            where.append("outstanding = ?")
+            args.append(int(outstanding))
+        if senator:
+            key = senator_key(senator)
+            where.append("(senator_key = ? OR instr(' ' || senator_key || ' ', ?) > 0)")
+            args += [key, f" {key} "]
+        if priority:
+            where.append("priority = ?")
+            args.append(priority.upper())
+        if committee:
+            where.append("committee = ?")
+            args.append(committee.upper())
+        if no_due:
+            where.append("due IS NULL")
+        if due_from:
+            where.append("due >= ?")
+            args.append(due_from.isoformat())
+        if due_to:
+            where.append("due <= ?")
+            args.append(due_to.isoformat())
+        for column, value in (("witness", witness), ("text", text)):
+            if value:
+                where.append(f"{column} LIKE ?")
+                args.append(f"%{value}%")
+        sql = (f"SELECT * FROM items WHERE {' AND '.join(where)} "
+               "ORDER BY due IS NULL, due, last_date DESC, CAST(number AS INTEGER)")
+        return [dict(r) for r in self.db.execute(sql, args)]
+
+
+def record(briefing, source=None, path=DEFAULT_DB):
+    """Record one rendered briefing; used by populate_template.render_briefing."""
+    with Register(path) as reg:
+        return reg.record_briefing(briefing, source)
+
+
+# ── CLI ──
+
+def due_window(spec, today):
+    """(from, to, none) for --due: overdue, today, week, month, none or an
+    ISO date (due on or before it)."""
+    if spec == "none":
+        return None, None, True
+    if spec == "overdue":
+        return None, today - timedelta(days=1), False
+    if spec == "today":
+        return today, today, False
+    if spec == "week":
+        monday = today - timedelta(days=today.weekday())
+        return monday, monday + timedelta(days=6), False
+    if spec == "month":
+        return today.replace(day=1), today.replace(
+            day=calendar.monthrange(today.year, today.month)[1]), False
+    return None, date.fromisoformat(spec), False
+
+
+def _print_items(items):
+    for it in items:
+        due = f"due {it['due']}" if it["due"] else "no due date"
+        seen = f", {it['hearings']} hearings" if it["hearings"] > 1 else ""
+        if it["kind"] == "qon":
+            print(f"{it['last_hearing']}  QoN {it['number']}  {it['senator']} \u2192 "
+                  f"{it['witness'] or '?'}  [{it['status']}; {due}{seen}]")
+        else:
+            print(f"{it['last_hearing']}  {it['priority']:<6}  {it['owner']}  "
+                  f"[{it['timeframe']}; {due}{seen}]")
+        print(f"    {it['text']}")
+    print(f"{len(items)} item(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Questions on notice and action items across hearings.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="register file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="record specs and _HIB_ DOCX files")
+    imp.add_argument("paths", nargs="+", help="specs, _HIB_ DOCX files or directories")
+    for name, helptext in (("qon", "list questions on notice"), ("actions", "list action items")):
+        q = sub.add_parser(name, help=helptext)
+        q.add_argument("--committee")
+        q.add_argument("--text", help="words in the question or action")
+        q.add_argument("--due", help="overdue, today, week, month, none or YYYY-MM-DD")
+        q.add_argument("--as-of", type=date.fromisoformat, default=None,
+                       help="treat this date as today")
+        q.add_argument("--json", action="store_true")
+        if name == "qon":
+            q.add_argument("--senator")
+            q.add_argument("--witness")
+            q.add_argument("--outstanding", action="store_true", default=None)
+        else:
+            q.add_argument("--priority", type=str.upper, choices=PRIORITIES)
+    args = parser.parse_args(argv)
+
+    with Register(args.db) as reg:
+        if args.command == "import":
+            total = 0
+            for path in find_targets(args.paths):
+                if path.lower().endswith(".docx"):
+                    n = reg.record_docx(path)
+                else:
+                    n = reg.record_briefing(load_briefing(path), path)
+                total += n
+                print(f"{path}: {n} item(s)")
+            print(f"{total} item(s) recorded in {args.db}")
+            return 0
+        due_from, due_to, no_due = (due_window(args.due, args.as_of or date.today())
+                                    if args.due else (None, None, False))
+        if args.command == "qon":
+            items = reg.query("qon", senator=args.senator, witness=args.witness,
+                              committee=args.committee, outstanding=args.outstanding,
+                              due_from=due_from, due_to=due_to, no_due=no_due, text=args.text)
+        else:
+            items = reg.query("action", priority=args.priority, committee=args.committee,
+                              due_from=due_from, due_to=due_to, no_due=no_due, text=args.text)
+    if args.json:
+        json.dump(items, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        _print_items(items)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""
+Full-text search over the archive of rendered briefings.
+
+    python search.py index out/
+    python search.py query '"RFA exemption"' layer:L2
+    python search.py query 'sections 38 42' committee:ECLC page:70-85 --json
+
+Every paragraph, list item and Part C table row of each _HIB_ DOCX is a
+passage, indexed with its hearing, Part (A/B/C), section title, layer and
+Hansard pages. Part B items take their section's page range unless they
+cite pages themselves; Part A subsections and priority flags and the Part C
+tables stand in for the layer there ('Hearing significance', 'Urgent
+action', 'Table 2: Key quotes').
+
+Documents are read by streaming word/document.xml (docx_package.iter_body)
+into an SQLite FTS5 index under .cache/. Re-indexing only reads files
+whose size or modification time changed, and only rebuilds those whose
+content hash changed; files that have gone are dropped.
+
+Query terms are ANDed; "quoted phrases" match in order; prefix* matches
+word starts. Fields: layer: (L1–L5 or words of a Part A/C heading), part:,
+section:, hearing:, committee:, page: (a page or range), since: and until:
+(YYYY-MM-DD).
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from docx_package import iter_body
+from register import HIB_NAME
+from template_cache import template_digest as file_digest
+from validate import find_targets
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(BASE, ".cache", "search.sqlite")
+INDEX_VERSION = 1       # bump when passage extraction changes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id           INTEGER PRIMARY KEY,
+    path         TEXT NOT NULL UNIQUE,
+    size         INTEGER,
+    mtime_ns     INTEGER,
+    digest       TEXT,
+    hearing      TEXT,
+    committee    TEXT,
+    hearing_date TEXT
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id       INTEGER PRIMARY KEY,
+    doc_id   INTEGER NOT NULL REFERENCES documents(id),
+    part     TEXT,
+    section  TEXT,
+    layer    TEXT,
+    page_lo  INTEGER,
+    page_hi  INTEGER,
+    text     TEXT
+);
+CREATE INDEX IF NOT EXISTS passages_doc ON passages(doc_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+    text, section, layer, content='passages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS passages_ai AFTER INSERT ON passages BEGIN
+    INSERT INTO passages_fts(rowid, text, section, layer)
+    VALUES (new.id, new.text, new.section, new.layer);
+END;
+CREATE TRIGGER IF NOT EXISTS passages_ad AFTER DELETE ON passages BEGIN
+    INSERT INTO passages_fts(passages_fts, rowid, text, section, layer)
+    VALUES ('delete', old.id, old.text, old.section, old.layer);
+END;
+"""
+
+
+class SearchError(ValueError):
+    """The index cannot be opened or a query cannot be parsed."""
+
+
+# ── Passages ──
+
+_PAGES = re.compile(r"\bpp?\.\s*(\d+)(?:\s*[\u2013\u2014-]\s*(\d+))?")
+
+
+def page_range(text):
+    """(lowest, highest) Hansard page cited in `text`, or (None, None)."""
+    lo = hi = None
+    for m in _PAGES.finditer(text or ""):
+        a = int(m[1])
+        b = int(m[2]) if m[2] else a
+        lo = a if lo is None else min(lo, a)
+        hi = b if hi is None else max(hi, b)
+    return lo, hi
+
+
+def passages(path):
+    """(part, section, layer, page_lo, page_hi, text) for every passage of
+    a rendered briefing, in document order."""
+    part = section = layer = None
+    section_pages = (None, None)
+    for block in iter_body(path):
+        if block[0] == "tbl":
+            rows = block[1]
+            if part == "B" and section and rows and len(rows[0]) == 2:
+                # The section's key-value table: Hansard pages, Witnesses
+                for key, value in rows:
+                    if key.lower().startswith("hansard"):
+                        section_pages = page_range(value)
+                    elif value:
+                        yield part, section, key, *section_pages, value
+            elif part == "C" and len(rows) > 1:
+                header = [h.lower() for h in rows[0]]
+                col = next((i for i, h in enumerate(header) if "hansard" in h), None)
+                for row in rows[1:]:
+                    if any(row):
+                        lo, hi = page_range(row[col]) if col is not None else (None, None)
+                        yield part, None, layer, lo, hi, " | ".join(c for c in row if c)
+            continue
+        _, style, text, _ = block
+        if style == "heading 1":
+            m = re.match(r"Part ([ABC])\b", text)
+            part, section, layer = (m.group(1) if m else None), None, None
+            section_pages = (None, None)
+        elif part is None or not text:
+            continue
+        elif style == "heading 2":
+            if part == "B":
+                section, layer, section_pages = text, None, (None, None)
+            else:
+                section = layer = text
+        elif style == "heading 3":
+            layer = text.split()[0] if part == "B" and re.match(r"L[1-5]\b", text) else text
+        elif part == "B" and not section:
+            continue  # grouping note
+        else:
+            lo, hi = page_range(text)
+            if lo is None:
+                lo, hi = section_pages if part == "B" else (None, None)
+            yield part, section, layer, lo, hi, text
+
+
+# ── Index ──
+
+class SearchIndex:
+    def __init__(self, path=DEFAULT_DB):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        try:
+            self.db.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            raise SearchError(f"{path}: {e} (SQLite needs FTS5)") from None
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            # Passages from an older extractor: re-read every document
+            self.db.execute("UPDATE documents SET size = NULL, digest = NULL")
+            self.db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.db.commit()
+        self.close()
+
+    def update(self, paths):
+        """Bring the index up to date with the _HIB_ DOCX files `paths`,
+        dropping indexed documents under the same directories that are no
+        longer there. Returns (indexed, unchanged, removed)."""
+        db = self.db
+        known = {r["path"]: r for r in db.execute("SELECT * FROM documents")}
+        indexed = unchanged = 0
+        for path in paths:
+            path = os.path.abspath(path)
+            st = os.stat(path)
+            row = known.pop(path, None)
+            if row is not None and (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                unchanged += 1
+                continue
+            digest = file_digest(path)
+            if row is not None and row["digest"] == digest:
+                db.execute("UPDATE documents SET size = ?, mtime_ns = ? WHERE id = ?",
+                           (st.st_size, st.st_mtime_ns, row["id"]))
+                unchanged += 1
+                continue
+            m = HIB_NAME.match(os.path.basename(path))
+            hearing = os.path.splitext(os.path.basename(path))[0]
+            when = f"{m['date'][:4]}-{m['date'][4:6]}-{m['date'][6:]}" if m else None
+            if row is None:
+                doc_id = db.execute(
+                    "INSERT INTO documents (path) VALUES (?)", (path,)).lastrowid
+            else:
+                doc_id = row["id"]
+                db.execute("DELETE FROM passages WHERE doc_id = ?", (doc_id,))
+            db.executemany(
+                "INSERT INTO passages (doc_id, part, section, layer, page_lo, page_hi, text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((doc_id, *p) for p in passages(path)))
+            db.execute("UPDATE documents SET size = ?, mtime_ns = ?, digest = ?, hearing = ?, "
+                       "committee = ?, hearing_date = ? WHERE id = ?",
+                       (st.st_size, st.st_mtime_ns, digest, hearing,
+                        m["committee"].upper() if m else None, when, doc_id))
+            indexed += 1
+        dirs = {os.path.dirname(os.path.abspath(p)) for p in paths}
+        removed = 0
+        for path, row in known.items():
+            if os.path.dirname(path) in dirs and not os.path.exists(path):
+                db.execute("DELETE FROM passages WHERE doc_id = ?", (row["id"],))
+                db.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+                removed += 1
+        db.commit()
+        return indexed, unchanged, removed
+
+    def search(self, query, limit=50):
+        """Passages matching `query` (see the module docstring), best
+        first, as dicts with a highlighted 'snippet'."""
+        match, where, args = parse_query(query)
+        if not match:
+            raise SearchError("query has no search terms")
+        sql = (
+            "SELECT d.hearing, d.committee, d.hearing_date, d.path, p.part, p.section,"
+            " p.layer, p.page_lo, p.page_hi, p.text,"
+            " snippet(passages_fts, 0, '[', ']', '\u2026', 16) AS snippet"
+            " FROM passages_fts JOIN passages p ON p.id = passages_fts.rowid"
+            " JOIN documents d ON d.id = p.doc_id"
+            f" WHERE passages_fts MATCH ? {''.join(' AND ' + w for w in where)}"
+            " ORDER BY bm25(passages_fts, 1.0, 0.5, 0.5), d.hearing_date, p.id LIMIT ?")
+        try:
+            return [dict(r) for r in self.db.execute(sql, [match, *args, limit])]
+        except sqlite3.OperationalError as e:
+            raise SearchError(f"bad query {query!r}: {e}") from None
+
+
+# ── Queries ──
+
+_TERM = re.compile(r'(\w+):("[^"]*"|\S+)|("[^"]*")|(\S+)')
+_FIELDS = {"layer", "part", "section", "hearing", "committee", "page", "since", "until"}
+
+
+def _fts_words(text):
+    """FTS5 tokens of plain text, each quoted so operators and punctuation
+    in user input are taken literally; a trailing * keeps prefix search."""
+    out = []
+    for word in re.findall(r"[\w*]+", text):
+        star = word.endswith("*")
+        word = word.strip("*")
+        if word:
+            out.append(f'"{word}"' + ("*" if star else ""))
+    return out
+
+
+def parse_query(query):
+    """Split a query into an FTS5 MATCH expression plus SQL conditions on
+    the passage and document columns."""
+    terms, where, args = [], [], []
+    for field, value, phrase, word in _TERM.findall(query):
+        if field and field.lower() in _FIELDS:
+            field, value = field.lower(), value.strip('"')
+            if field in ("layer", "section"):
+                words = _fts_words(value)
+                if words:
+                    terms.append(f"{field} : ({' '.join(words)})")
+            elif field == "part":
+                where.append("p.part = ?")
+                args.append(value.upper().removeprefix("PART").strip())
+            elif field in ("hearing", "committee"):
+                where.append(f"d.{field} LIKE ?")
+                args.append(f"{value}%")
+            elif field == "page":
+                lo, _, hi = value.partition("-")
+                if not lo.isdigit() or (hi and not hi.isdigit()):
+                    raise SearchError(f"page: expects a page or range, not {value!r}")
+                where.append("p.page_lo <= ? AND p.page_hi >= ?")
+                args += [int(hi or lo), int(lo)]
+            else:
+                where.append("d.hearing_date " + (">= ?" if field == "since" else "<= ?"))
+                args.append(value)
+        elif phrase:
+            words = _fts_words(phrase)
+            if words:
+                terms.append(" + ".join(words))
+        else:
+            terms += _fts_words(word or f"{field} {value}")
+    return " AND ".join(terms), where, args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the archive of rendered briefings.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="index file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    idx = sub.add_parser("index", help="index new and changed _HIB_ DOCX files")
+    idx.add_argument("paths", nargs="+", help="_HIB_ DOCX files or directories")
+    q = sub.add_parser("query", help="search the index")
+    q.add_argument("terms", nargs="+", help='words, "phrases" and field:value filters')
+    q.add_argument("-n", "--limit", type=int, default=20)
+    q.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    with SearchIndex(args.db) as index:
+        t = time.perf_counter()
+        if args.command == "index":
+            paths = [p for p in find_targets(args.paths) if p.lower().endswith(".docx")]
+            done, same, gone = index.update(paths)
+            print(f"{done} indexed, {same} unchanged, {gone} removed "
+                  f"({(time.perf_counter() - t) * 1000:.0f} ms)")
+            return 0
+        try:
+            hits = index.search(" ".join(args.terms), args.limit)
+        except SearchError as e:
+            parser.error(str(e))
+        ms = (time.perf_counter() - t) * 1000
+    if args.json:
+        json.dump(hits, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    for h in hits:
+        where = [f"Part {h['part']}"] + [x for x in (h["section"],) if x]
+        if h["layer"] and h["layer"] != h["section"]:
+            where.append(h["layer"])
+        if h["page_lo"] is not None:
+            where.append(f"p. {h['page_lo']}" if h["page_lo"] == h["page_hi"]
+                         else f"pp. {h['page_lo']}\u2013{h['page_hi']}")
+        print(f"{h['hearing']}  {' / '.join(where)}\n    {h['snippet']}")
+    print(f"{len(hits)} passage(s) in {ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Skeleton cache for briefing templates.
+A skeleton is the template package with the body already stripped back to
+the cover block and the generated run styles added (see
+populate_template.prepare_skeleton). Building one means parsing the full
+template and deleting the example content, so it is done
+once per template and kept both in memory (LRU across templates) and on
+disk under .cache/skeletons/, keyed by the template's SHA-256 and the
+strip version.
+Each render gets its own Document parsed from the small stripped package.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from docx import Document
+
+import instrument
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE, ".cache", "skeletons")
+
+
+def template_digest(path):
+    """SHA-256 hex digest of the template file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SkeletonCache:
+    """LRU cache of stripped template packages, keyed by content hash.
+
+    `strip` is called with a freshly loaded Document and must remove the
+    body content that every render rebuilds; bump `version` whenever
+    `strip` changes. Pass cache_dir=None to keep skeletons in memory only.
+    """
+
+    def __init__(self, strip, version=1, maxsize=8, cache_dir=CACHE_DIR):
+        self.strip = strip
+        self.version = version
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._blobs = OrderedDict()   # digest -> stripped .docx bytes
+        self._digests = {}            # (path, mtime_ns, size) -> digest
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def digest(self, path):
+        """Content hash of the template at `path` (memoised by mtime/size)."""
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = template_digest(path)
+        return digest
+
+    def _disk_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}-v{self.version}.docx")
+
+    def _build(self, path, digest):
+        if self.cache_dir:
+            cached = self._disk_path(digest)
+            if os.path.exists(cached):
+                with open(cached, "rb") as f:
+                    return f.read()
+        with instrument.span('template.load'):
+            doc = Document(path)
+        with instrument.span('template.strip'):
+            self.strip(doc)
+        buf = io.BytesIO()
+        doc.save(buf)
+        blob = buf.getvalue()
+        if self.cache_dir:
+            # Write-then-rename so concurrent workers never see a partial file
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._disk_path(digest))
+        return blob
+
+    def skeleton(self, path):
+        """Return the stripped package bytes for the template at `path`."""
+        digest = self.digest(path)
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is not None:
+                self._blobs.move_to_end(digest)
+                self.hits += 1
+                return blob
+            self.misses += 1
+            blob = self._build(path, digest)
+            self._blobs[digest] = blob
+            while len(self._blobs) > self.maxsize:
+                self._blobs.popitem(last=False)
+            return blob
+
+    def document(self, path):
+        """Return a new, independent Document cloned from the skeleton."""
+        return Document(io.BytesIO(self.skeleton(path)))
+
+    def clear(self):
+        with self._lock:
+            self._blobs.clear()
+            self._digests.clear()
@@ -0,0 +1,21 @@
+from briefing_ir import DataTable, Heading, HtmlSink, KeyValueTable, TextSink
+
+NODES = [Heading(1, "Part C: Reference tables"),
+         DataTable(["No.", "Question", "Witness"], [[7, "Offsets data", "DCCEEW"]]),
+         KeyValueTable([("Questions", 3)])]
+
+
+def test_text_sink_accepts_number_cells():
+    sink = TextSink(parts="C")
+    sink.unit("part_c", NODES)
+    text = sink.getvalue()
+    assert "- 7; Offsets data; DCCEEW" in text
+    assert "Questions: 3" in text
+
+
+def test_html_sink_accepts_number_cells():
+    sink = HtmlSink()
+    sink.unit("part_c", NODES)
+    html = sink.getvalue()
+    assert "<td>7</td><td>Offsets data</td>" in html
+    assert "<th>Questions</th><td>3</td>" in html
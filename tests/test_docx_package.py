@@ -0,0 +1,26 @@
+import docx_package
+import populate_template as pt
+from docx_package import open_package, save_package
+
+
+def test_mapped_package_is_unmapped_on_close():
+    with open_package(pt.TEMPLATE, use_mmap=True) as zin:
+        mapped = zin._map
+        assert zin.read(docx_package.DOCUMENT_PART).startswith(b"<?xml")
+    assert mapped.closed
+
+
+def test_mapped_save_matches_buffered(tmp_path, monkeypatch):
+    opened = []
+    real = docx_package._MappedPackage
+
+    def tracked(path):
+        opened.append(real(path))
+        return opened[-1]
+
+    monkeypatch.setattr(docx_package, "_MappedPackage", tracked)
+    doc = pt.skeletons.document(pt.TEMPLATE)
+    save_package(doc, pt.TEMPLATE, tmp_path / "buffered.docx")
+    save_package(doc, pt.TEMPLATE, tmp_path / "mapped.docx", use_mmap=True)
+    assert len(opened) == 1 and opened[0]._map.closed
+    assert (tmp_path / "mapped.docx").read_bytes() == (tmp_path / "buffered.docx").read_bytes()
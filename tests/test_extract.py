@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+import extract
+import populate_template as pt
+
+PDF = os.path.join(pt.BASE, "sources", "ECLC_Hansard-20251114.pdf")
+
+pytestmark = pytest.mark.skipif(extract.PdfReader is None, reason="pypdf not installed")
+
+
+@pytest.fixture
+def small_pdf(tmp_path):
+    """The sample transcript's first two pages, as a path factory."""
+    from pypdf import PdfWriter
+    source = extract.PdfReader(PDF)
+
+    def make(name="transcript.pdf"):
+        writer = PdfWriter()
+        for page in source.pages[:2]:
+            writer.add_page(page)
+        path = str(tmp_path / name)
+        with open(path, "wb") as f:
+            writer.write(f)
+        return path
+    return make
+
+
+def test_serial_extraction_keeps_no_reader(small_pdf, monkeypatch):
+    monkeypatch.setattr(extract, "_readers", extract.OrderedDict())
+    assert len(extract.extract_pdf(small_pdf(), workers=1)) == 2
+    assert not extract._readers
+
+
+def test_worker_readers_are_bounded_and_follow_changes(small_pdf, monkeypatch):
+    monkeypatch.setattr(extract, "_readers", extract.OrderedDict())
+    path = small_pdf()
+    first = extract._reader(path)
+    assert extract._reader(path) is first
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert extract._reader(path) is not first     # a saved transcript is re-read
+    for i in range(extract.READERS + 2):
+        extract._reader(small_pdf(f"other{i}.pdf"))
+    assert len(extract._readers) == extract.READERS
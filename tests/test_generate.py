@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+
+import pytest
+from docx import Document
+
+import generate
+import populate_template as pt
+from briefing_spec import LAYERS, load_briefing
+
+TRANSCRIPT = os.path.join(pt.BASE, "sources", "ECLC_Hansard-20251114.pdf")
+
+
+def run_stub(tmp_path, retries=4):
+    meta = generate.hearing_meta(TRANSCRIPT, 3)
+    with generate.StubServer() as stub:
+        pipeline = generate.Pipeline(generate.HTTPEndpoint(stub.url), retries=retries, backoff=0)
+        spec, output = asyncio.run(pipeline.run(TRANSCRIPT, meta, str(tmp_path)))
+    return spec, output, pipeline
+
+
+def test_stub_generation_end_to_end(tmp_path):
+    spec, output, pipeline = run_stub(tmp_path)
+    assert os.path.basename(output) == "ECLC_HIB_003_20251114.docx"
+    assert sorted(os.listdir(tmp_path)) == ["ECLC_HIB_003_20251114.docx",
+                                            "ECLC_HIB_003_20251114.json"]
+
+    briefing = load_briefing(spec)
+    assert briefing.committee_code == "ECLC" and briefing.number == 3
+    assert briefing.sections and all(s.L1 for s in briefing.sections)
+    assert briefing.part_a.significance == ["Stub significance"] * 5
+    assert briefing.quotes and briefing.actions
+
+    text = "\n".join(p.text for p in Document(output).paragraphs)
+    for section in briefing.sections:
+        assert section.title in text
+    # one request per transcript chunk; a long bloc may take several
+    assert pipeline.metrics["sections"].summary()["requests"] >= len(briefing.sections)
+
+
+def test_unexpected_part_a_keys_are_dropped(tmp_path, monkeypatch):
+    reply = generate._stub_reply
+
+    def chatty(prompt):
+        data = reply(prompt)
+        if prompt.startswith("TASK: part_a"):
+            data["word_count"] = 640
+            data["priority_flags"]["watch_list"] = ["Stub"]
+        return data
+
+    monkeypatch.setattr(generate, "_stub_reply", chatty)
+    spec, output, _ = run_stub(tmp_path)
+    assert os.path.exists(output)
+    assert load_briefing(spec).part_a.significance == ["Stub significance"] * 5
+
+
+def test_known_fields_passes_non_mappings_through():
+    assert generate.known_fields(generate.PartA, ["not", "a", "mapping"]) == ["not", "a", "mapping"]
+
+
+def malformed_part_c(monkeypatch, times):
+    """Stub whose first `times` part_c replies have string rows."""
+    reply, bad = generate._stub_reply, [times]
+
+    def stub(prompt):
+        data = reply(prompt)
+        if prompt.startswith("TASK: part_c") and bad[0]:
+            bad[0] -= 1
+            data["actions"] = ["Review offsets"]
+        return data
+
+    monkeypatch.setattr(generate, "_stub_reply", stub)
+
+
+def test_malformed_reply_is_retried(tmp_path, monkeypatch):
+    malformed_part_c(monkeypatch, 1)
+    spec, output, pipeline = run_stub(tmp_path)
+    assert os.path.exists(output)
+    assert pipeline.metrics["part_c"].retries == 1
+    assert all(a.priority for a in load_briefing(spec).actions)
+
+
+def test_persistently_malformed_reply_fails_the_run(tmp_path, monkeypatch):
+    malformed_part_c(monkeypatch, 99)
+    with pytest.raises(generate.GenerationError, match="'actions' is not a list of objects"):
+        run_stub(tmp_path, retries=1)
+    assert not os.listdir(tmp_path)
+
+
+def test_layer_given_as_string_is_rejected():
+    reply = json.dumps({**dict.fromkeys(LAYERS, []), "L1": "One long paragraph"})
+    with pytest.raises(ValueError, match="'L1' is not a list of strings"):
+        generate.parse_json(reply, LAYERS, generate.SECTION_SHAPE)
@@ -0,0 +1,34 @@
+from quote_check import ELISION_GAP, PARTIAL, VERBATIM, scan
+
+FILLER = " ".join(f"w{i}" for i in range(ELISION_GAP + 10))
+
+
+def status(tmp_path, text, quote):
+    path = tmp_path / "transcript.txt"
+    path.write_text(text, encoding="utf-8")
+    return scan(str(path), [quote])[0][0]
+
+
+def test_elided_quote_in_order_is_verbatim(tmp_path):
+    text = "The bill is not there. We said so. It can get there with fixes.\n"
+    assert status(tmp_path, text, "‘The bill is not there … it can get there.’") == VERBATIM
+
+
+def test_elided_quote_across_adjacent_pages_is_verbatim(tmp_path):
+    text = "The bill is not there.\n\fit can get there.\n"
+    assert status(tmp_path, text, "The bill is not there ... it can get there") == VERBATIM
+
+
+def test_fragments_out_of_order_are_partial(tmp_path):
+    text = "It can get there. Later on: the bill is not there.\n"
+    assert status(tmp_path, text, "The bill is not there ... it can get there") == PARTIAL
+
+
+def test_fragments_far_apart_are_partial(tmp_path):
+    text = f"The bill is not there. {FILLER} It can get there.\n"
+    assert status(tmp_path, text, "The bill is not there ... it can get there") == PARTIAL
+
+
+def test_fragments_pages_apart_are_partial(tmp_path):
+    text = "The bill is not there.\n\fnothing\n\fit can get there.\n"
+    assert status(tmp_path, text, "The bill is not there ... it can get there") == PARTIAL
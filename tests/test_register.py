@@ -0,0 +1,23 @@
+import json
+import os
+
+import populate_template as pt
+import register
+from briefing_spec import Briefing
+
+SPEC = os.path.join(pt.BASE, "briefings", "ECLC_HIB_003_20251114.json")
+
+
+def test_render_records_int_qon_number(tmp_path):
+    with open(SPEC, encoding="utf-8") as f:
+        data = json.load(f)
+    data["questions_on_notice"] = [{"number": 1, "question": "Offsets data by region",
+                                    "witness": "DCCEEW", "senator": "Senator Duniam",
+                                    "status": "Outstanding"}]
+    db = str(tmp_path / "register.sqlite")
+    output = pt.render_briefing(Briefing.from_dict(data), str(tmp_path), register_db=db)
+    assert os.path.exists(output)
+    with register.Register(db) as reg:
+        qons = reg.query("qon")
+    assert [(q["number"], q["text"]) for q in qons if q["text"] == "Offsets data by region"] \
+        == [("1", "Offsets data by region")]
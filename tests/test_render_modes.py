@@ -0,0 +1,33 @@
+import os
+import zipfile
+
+import populate_template as pt
+from briefing_spec import load_briefing
+from docx_package import DOCUMENT_PART
+from fragment_cache import FragmentCache
+
+SPEC = os.path.join(pt.BASE, "briefings", "ECLC_HIB_003_20251114.json")
+
+
+def document_xml(path):
+    with zipfile.ZipFile(path) as z:
+        return z.read(DOCUMENT_PART)
+
+
+def test_every_mode_writes_the_serial_document(tmp_path):
+    briefing = load_briefing(SPEC)
+    out = {}
+    for mode in ("save", "stream", "parallel"):
+        os.makedirs(tmp_path / mode)
+        out[mode] = document_xml(pt.render_briefing(briefing, str(tmp_path / mode), mode=mode))
+
+    cache = FragmentCache(cache_dir=str(tmp_path / "fragments"))
+    units = len(list(pt.ir.body_units(briefing)))
+    for run, expect in (("cold", units), ("warm", 0)):
+        path = str(tmp_path / f"incremental-{run}.docx")
+        assert pt.render_incremental(briefing, path, cache=cache) == expect
+        out[f"incremental ({run})"] = document_xml(path)
+
+    assert out["save"].count(b"<w:tbl>") > 2
+    for mode, xml in out.items():
+        assert xml == out["save"], mode
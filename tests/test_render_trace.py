@@ -0,0 +1,20 @@
+import os
+
+import instrument
+import populate_template as pt
+from briefing_spec import load_briefing
+
+SPEC = os.path.join(pt.BASE, "briefings", "ECLC_HIB_003_20251114.json")
+
+
+def test_parallel_trace_records_unit_work(tmp_path):
+    briefing = load_briefing(SPEC)
+    instrument.enable()
+    try:
+        pt.render_briefing(briefing, str(tmp_path), mode='parallel')
+    finally:
+        tracer = instrument.disable()
+    totals = tracer.totals()
+    assert totals["part_b.section"]["calls"] == len(briefing.sections)
+    assert totals["table"]["calls"] > 0
+    assert tracer.counts["paragraphs"] > 0 and tracer.counts["cells"] > 0
@@ -0,0 +1,62 @@
+"""strip_body keeps the baseline cover block and truncates in linear time."""
+import time
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from lxml import etree
+
+import populate_template as pt
+from docx_xml import W_SECTPR
+
+PARA = "<w:p><w:r><w:t>Synthetic body paragraph</w:t></w:r></w:p>"
+TABLE = ("<w:tbl><w:tblPr/><w:tblGrid><w:gridCol w:w='4000'/></w:tblGrid>"
+         "<w:tr><w:tc><w:p/></w:tc></w:tr></w:tbl>")
+
+
+def padded(n):
+    """The template with `n` extra blocks (one table in ten) before its sectPr."""
+    doc = Document(pt.TEMPLATE)
+    blocks = "".join(TABLE if i % 10 == 0 else PARA for i in range(n))
+    wrapper = parse_xml(f"<w:body {nsdecls('w')}>{blocks}</w:body>")
+    sect = doc.element.body.find(W_SECTPR)
+    for el in list(wrapper):
+        sect.addprevious(el)
+    return doc
+
+
+def strip_time(n, repeats=3):
+    best = None
+    for _ in range(repeats):
+        doc = padded(n)
+        t = time.perf_counter()
+        pt.strip_body(doc)
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def test_strip_body_keeps_baseline_cover_block():
+    doc = Document(pt.TEMPLATE)
+    pt.strip_body(doc)
+    # Baseline: paragraphs [0]-[5] and tables [0]-[1] (cover + AI), then sectPr
+    assert len(doc.paragraphs) == 6
+    assert len(doc.tables) == 2
+    assert doc.element.body[-1].tag == W_SECTPR
+    assert "Senate committee hearing" not in [p.text for p in doc.paragraphs]
+
+
+def test_strip_body_removes_padding():
+    doc = padded(1000)
+    pt.strip_body(doc)
+    stripped = Document(pt.TEMPLATE)
+    pt.strip_body(stripped)
+    assert etree.tostring(doc.element.body) == etree.tostring(stripped.element.body)
+
+
+def test_strip_body_scales_linearly():
+    small, large = 10_000, 40_000
+    per_block_small = strip_time(small) / small
+    per_block_large = strip_time(large) / large
+    # Quadratic truncation would make the 4x larger body ~4x slower per block
+    assert per_block_large < 2.5 * per_block_small
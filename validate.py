@@ -0,0 +1,196 @@
+"""
+Check a briefing against the structural limits in prompt.md.
+
+    python validate.py briefings/ECLC_HIB_003_20251114.json
+    python validate.py out/ [--json]          # every spec and _HIB_ DOCX
+
+Specs are checked from the loaded Briefing; finished DOCX files are checked
+by streaming word/document.xml with iterparse, so python-docx is never
+involved and an archive of outputs checks in seconds. Both paths feed the
+same events (part, heading, list item) into one Validator, so a spec and
+the DOCX rendered from it give the same results.
+
+Limits: Part A at most 800 words of content; significance 5–7 points;
+each priority flag category 2–5 points or 'Nil'; political temperature
+4–7; forward look 3–5; per section L1 5–15, L2 3–8, L3 3–6, L4 3–8,
+L5 2–5, where any layer may instead be a single "low signal" statement.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+import briefing_ir as ir
+from briefing_spec import SPEC_SUFFIXES, load_briefing
+from docx_package import iter_body
+
+PART_A_MAX_WORDS = 800
+PART_A_LIMITS = {
+    "Hearing significance": ("significance", 5, 7),
+    "Political temperature": ("political_temperature", 4, 7),
+    "Forward look": ("forward_look", 3, 5),
+}
+FLAG_LIMITS = (2, 5)
+FLAG_TITLES = dict(ir.FLAG_TITLES)
+LAYER_LIMITS = {"L1": (5, 15), "L2": (3, 8), "L3": (3, 6), "L4": (3, 8), "L5": (2, 5)}
+
+_WORDS = re.compile(r"\S+")
+
+
+class Validator:
+    """Counts items per Part A subsection, priority flag and section layer
+    from a stream of structural events, then checks them against the limits."""
+
+    def __init__(self, source):
+        self.source = source
+        self.part = None
+        self.counts = {}        # path -> [title, items]
+        self.order = []
+        self.sections = 0
+        self.current = None
+        self.part_a_words = 0
+
+    def _bucket(self, path, title):
+        if path not in self.counts:
+            self.counts[path] = [title, []]
+            self.order.append(path)
+        self.current = path
+
+    def heading1(self, text):
+        m = re.match(r"Part ([ABC])\b", text)
+        self.part = m.group(1) if m else None
+        self.current = None
+
+    def heading2(self, text):
+        if self.part == "A":
+            key = PART_A_LIMITS.get(text, (None,))[0]
+            self.current = None
+            if key:
+                self._bucket(f"part_a.{key}", text)
+        elif self.part == "B":
+            self.sections += 1
+            self.section_title = text
+            self.current = None
+
+    def heading3(self, text):
+        if self.part == "A" and text in FLAG_TITLES:
+            self._bucket(f"part_a.priority_flags.{FLAG_TITLES[text]}", text)
+        elif self.part == "B" and self.sections:
+            layer = text.split()[0] if text[:2] in LAYER_LIMITS else None
+            self.current = None
+            if layer:
+                self._bucket(f"sections[{self.sections - 1}].{layer}",
+                             f"{self.section_title} \u2013 {layer}")
+
+    def item(self, text):
+        if self.part == "A":
+            self.part_a_words += len(_WORDS.findall(text))
+        if self.current:
+            self.counts[self.current][1].append(text)
+
+    def results(self):
+        out = [self._check(path, *self.counts[path]) for path in self.order]
+        out.append({"path": "part_a", "title": "Part A words", "count": self.part_a_words,
+                    "min": 0, "max": PART_A_MAX_WORDS, "ok": self.part_a_words <= PART_A_MAX_WORDS,
+                    "message": "" if self.part_a_words <= PART_A_MAX_WORDS
+                    else f"{self.part_a_words} words (max {PART_A_MAX_WORDS})"})
+        return out
+
+    def _check(self, path, title, items):
+        key = path.rsplit(".", 1)[-1]
+        n = len(items)
+        if ".priority_flags." in path:
+            lo, hi = FLAG_LIMITS
+            ok = lo <= n <= hi or [i.strip().rstrip(".").lower() for i in items] == ["nil"]
+        elif key in LAYER_LIMITS:
+            lo, hi = LAYER_LIMITS[key]
+            # A thin layer may instead carry one explicit "low signal" statement
+            ok = lo <= n <= hi or (n == 1 and "low signal" in items[0].lower())
+        else:
+            lo, hi = next(v[1:] for v in PART_A_LIMITS.values() if v[0] == key)
+            ok = lo <= n <= hi
+        message = "" if ok else f"{n} points (expected {lo}\u2013{hi})"
+        return {"path": path, "title": title, "count": n, "min": lo, "max": hi,
+                "ok": ok, "message": message}
+
+
+def validate_briefing(briefing, source="spec"):
+    """Results for an in-memory Briefing, from the same IR the renderer uses."""
+    v = Validator(source)
+    for _, unit, payload in ir.body_units(briefing):
+        for node in unit(payload):
+            if type(node) is ir.Heading:
+                getattr(v, f"heading{node.level}")(node.text)
+            elif type(node) is ir.ListItem:
+                v.item(node.text)
+    return v.results()
+
+
+def validate_docx(path):
+    """Results for a rendered briefing, streamed from word/document.xml."""
+    v = Validator(path)
+    for block in iter_body(path, tables=False):
+        if block[0] != "p":
+            continue
+        _, style, text, numbered = block
+        if style == "heading 1":
+            v.heading1(text)
+        elif style == "heading 2":
+            v.heading2(text)
+        elif style == "heading 3":
+            v.heading3(text)
+        elif numbered:
+            v.item(text)
+    return v.results()
+
+
+def validate_path(path):
+    if path.lower().endswith(".docx"):
+        return validate_docx(path)
+    return validate_briefing(load_briefing(path), path)
+
+
+def find_targets(paths):
+    """Spec files and _HIB_ DOCX outputs under the given files/directories."""
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            for name in sorted(os.listdir(p)):
+                low = name.lower()
+                if name.startswith("~$"):
+                    continue
+                if low.endswith(SPEC_SUFFIXES) or (low.endswith(".docx") and "_HIB_" in name):
+                    found.append(os.path.join(p, name))
+        else:
+            found.append(p)
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check briefings against the prompt.md limits.")
+    parser.add_argument("paths", nargs="+", help="specs, _HIB_ DOCX files or directories")
+    parser.add_argument("--json", action="store_true", help="machine-readable results")
+    parser.add_argument("--all", action="store_true", help="list passing checks too")
+    args = parser.parse_args(argv)
+
+    report, failed = {}, 0
+    for path in find_targets(args.paths):
+        results = validate_path(path)
+        failed += sum(not r["ok"] for r in results)
+        report[path] = results
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for path, results in report.items():
+            bad = [r for r in results if not r["ok"]]
+            print(f"{path}: {'OK' if not bad else f'{len(bad)} problem(s)'}")
+            for r in results if args.all else bad:
+                mark = "ok " if r["ok"] else "!! "
+                print(f"  {mark}{r['path']:<38} {r['count']:>4}  {r['message'] or r['title']}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
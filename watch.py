@@ -0,0 +1,261 @@
+"""
+Watch mode: keep the renderer warm and regenerate briefings on save.
+
+    python watch.py [briefings/] [-s sources/] [-o out/]
+
+Watches the spec directories, sources/ and the template. A changed spec is
+re-rendered and a changed template re-renders everything. The DOCX does
+not depend on the transcript, so a changed transcript instead re-runs the
+quote and name checks for every spec of the same committee and hearing
+date (matched on the [COMMITTEE]_..._[YYYYMMDD] file name). Rapid saves are
+debounced and changes that land together are coalesced into one batch.
+python-docx, the stripped template skeleton and the fragment cache stay
+resident, so renders use --incremental and only rebuild what changed.
+
+Uses inotify on Linux and falls back to polling file mtimes elsewhere.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import names_check
+import populate_template as pt
+import quote_check
+import register
+from briefing_spec import SPEC_SUFFIXES, find_specs, load_briefing
+from hansard import TRANSCRIPT_NAME, TRANSCRIPT_SUFFIXES, find_transcripts
+
+
+def _ignored(name):
+    # Word lock files (~$...), editor swap/backup and our own temp files
+    return name.startswith(("~$", ".")) or name.endswith(("~", ".tmp", ".swp"))
+
+
+# ── File watchers ──
+
+class PollingWatcher:
+    """Portable watcher: compares (mtime, size) of directory entries."""
+
+    def __init__(self, dirs, interval=0.25):
+        self.dirs = dirs
+        self.interval = interval
+        self._seen = self._scan()
+
+    def _scan(self):
+        state = {}
+        for d in self.dirs:
+            try:
+                entries = list(os.scandir(d))
+            except FileNotFoundError:
+                continue
+            for e in entries:
+                if e.is_file() and not _ignored(e.name):
+                    st = e.stat()
+                    state[e.path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def poll(self, timeout):
+        """Return the set of paths changed within `timeout` seconds
+        (None waits until something changes)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._seen.keys()
+                       if current.get(p) != self._seen.get(p)}
+            self._seen = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None
+                       else max(0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over ctypes; no third-party dependency."""
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_DELETE
+        self._dirs = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(d), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"cannot watch {d}")
+            self._dirs[wd] = d
+
+    def poll(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self._fd, 1 << 16)
+        changed, pos = set(), 0
+        while pos < len(data):
+            wd, _mask, _cookie, length = self._EVENT.unpack_from(data, pos)
+            pos += self._EVENT.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+            pos += length
+            if name and not _ignored(name) and wd in self._dirs:
+                changed.add(os.path.join(self._dirs[wd], name))
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def make_watcher(dirs):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(dirs)
+
+
+# ── Daemon ──
+
+class BriefingDaemon:
+    """Maps changed files to the specs they affect; re-renders them, or
+    re-checks them against a changed transcript."""
+
+    def __init__(self, spec_dirs, sources, output_dir, template=pt.TEMPLATE,
+                 debounce=0.2, log=print, register_db=None):
+        self.spec_dirs = [os.path.abspath(d) for d in spec_dirs]
+        self.sources = os.path.abspath(sources)
+        self.output_dir = output_dir
+        self.template = os.path.abspath(template)
+        self.debounce = debounce
+        self.log = log
+        self.register_db = register_db
+        self.specs = {}   # spec path -> (committee_code, YYYYMMDD) or None if invalid
+        for path in find_specs(self.spec_dirs):
+            self._load(path)
+
+    def _load(self, path):
+        try:
+            b = load_briefing(path)
+        except (OSError, ValueError) as e:  # SpecError and JSON errors are ValueErrors
+            self.log(f"! {os.path.basename(path)}: {e}")
+            self.specs[path] = None
+            return None
+        self.specs[path] = (b.committee_code.upper(), f"{b.hearing_date:%Y%m%d}")
+        return b
+
+    def affected(self, changed):
+        """Spec paths to re-render and spec paths to re-check, for a batch of
+        changed files."""
+        todo, recheck = set(), set()
+        for path in changed:
+            d, name = os.path.split(path)
+            if path == self.template:
+                todo.update(p for p in self.specs if os.path.exists(p))
+            elif d in self.spec_dirs and name.lower().endswith(SPEC_SUFFIXES):
+                if os.path.exists(path):
+                    todo.add(path)
+                else:
+                    self.specs.pop(path, None)
+            elif d == self.sources and name.lower().endswith(TRANSCRIPT_SUFFIXES):
+                m = TRANSCRIPT_NAME.match(name)
+                if m:
+                    key = (m["committee"].upper(), m["date"])
+                    recheck.update(p for p, k in self.specs.items() if k == key)
+        return sorted(todo), sorted(recheck - todo)
+
+    def render(self, spec_paths):
+        for path in spec_paths:
+            t = time.perf_counter()
+            briefing = self._load(path)
+            if briefing is None:
+                continue
+            try:
+                output = pt.render_briefing(briefing, self.output_dir, self.template,
+                                            mode='incremental', register_db=self.register_db)
+            except Exception as e:  # keep the daemon alive; report and move on
+                self.log(f"! {os.path.basename(path)}: render failed: {e}")
+                continue
+            ms = (time.perf_counter() - t) * 1000
+            self.log(f"  {os.path.basename(output)}  {ms:.0f} ms")
+
+    def check(self, spec_paths):
+        """Re-run the transcript checks (quotes, then names) for each spec."""
+        for path in spec_paths:
+            briefing = self._load(path)
+            if briefing is None:
+                continue
+            name = os.path.basename(path)
+            transcripts = find_transcripts(self.sources, briefing.committee_code,
+                                           f"{briefing.hearing_date:%Y%m%d}")
+            try:
+                quotes = quote_check.check_quotes(briefing, transcripts) if transcripts else []
+                issues = names_check.check_archive([path], self.sources)
+            except Exception as e:  # a half-written transcript must not stop the daemon
+                self.log(f"! {name}: check failed: {e}")
+                continue
+            bad = [r for r in quotes if r["status"] in quote_check.FLAGGED]
+            for r in bad:
+                self.log(f"! {name}: {r['status']} quote ({r['speaker']}): {r['quote'][:60]}")
+            for i in issues:
+                self.log(f"! {name}: {i.kind} {i.where}: {i.detail}")
+            self.log(f"  {name}: checked {len(quotes)} quote(s), {len(bad) + len(issues)} finding(s)")
+
+    def run(self, watcher=None):
+        os.makedirs(self.output_dir, exist_ok=True)
+        pt.skeletons.skeleton(self.template)  # warm before the first save
+        dirs = self.spec_dirs + [self.sources, os.path.dirname(self.template)]
+        watcher = watcher or make_watcher([d for d in dict.fromkeys(dirs) if os.path.isdir(d)])
+        self.log(f"Watching {len(self.specs)} spec(s); Ctrl+C to stop")
+        pending, deadline = set(), None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                changed = watcher.poll(timeout)
+                if changed:
+                    pending |= changed
+                    deadline = time.monotonic() + self.debounce
+                elif pending and time.monotonic() >= deadline:
+                    todo, recheck = self.affected(pending)
+                    self.render(todo)
+                    self.check(recheck)
+                    pending, deadline = set(), None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate briefings when specs or transcripts change.")
+    parser.add_argument("specs", nargs="*", default=[os.path.join(pt.BASE, "briefings")],
+                        help="spec directories to watch (default: briefings/)")
+    parser.add_argument("-s", "--sources", default=os.path.join(pt.BASE, "sources"))
+    parser.add_argument("-o", "--output-dir", default=pt.BASE)
+    parser.add_argument("-t", "--template", default=pt.TEMPLATE)
+    parser.add_argument("--debounce", type=float, default=0.2,
+                        help="seconds of quiet before rendering a batch")
+    parser.add_argument("--register", default=register.DEFAULT_DB,
+                        help="QoN and action register to update (default: %(default)s)")
+    parser.add_argument("--no-register", dest="register", action="store_const", const=None,
+                        help="do not record QoNs and action items")
+    args = parser.parse_args(argv)
+    BriefingDaemon(args.specs, args.sources, args.output_dir, args.template,
+                   args.debounce, register_db=args.register).run()
+
+
+if __name__ == "__main__":
+    main()